@@ -14,7 +14,11 @@ Python types.  Supported value types are:
 ``float``
     Stored as ``REAL``.
 ``list`` and ``dict``
-    Serialised to JSON strings and stored as ``TEXT``.
+    Serialised to JSON with :func:`json.dumps` and stored as ``TEXT``.
+    Decoded with ``orjson`` or ``msgspec`` when available.
+``list[int]`` and ``list[float]``
+    Packed as 64-bit machine values with :mod:`array` and stored as
+    ``BLOB``.  Decoded back to a plain ``list``.
 
 The implementation is intentionally lightweight to satisfy the needs of
 the unit tests in this kata.
@@ -22,11 +26,19 @@ the unit tests in this kata.
 
 from __future__ import annotations
 
+import array
+import functools
 import json
+import operator
 import os
+import re
 import sqlite3
+import threading
 import time
-from typing import Any, Dict, Iterable, Optional, Tuple
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union, get_args, get_origin
 
 # Optional on non-POSIX systems; guarded in code
 try:
@@ -36,6 +48,295 @@ except Exception:  # pragma: no cover
 
 from urllib.parse import quote as urlquote
 
+# list/dict columns are always encoded by the standard library with its
+# default options, so stored text (and the equality filters run against it)
+# is identical whichever optional packages are installed and matches rows
+# written by earlier versions.  The encoders of orjson and msgspec differ in
+# NaN/infinity, big-int and float exponent output, so they are only used to
+# decode, which is format-agnostic.
+
+
+def _json_dumps(value: Any) -> str:
+    return json.dumps(value)
+
+
+try:
+    import orjson  # type: ignore
+
+    def _json_loads(value: Any) -> Any:
+        try:
+            return orjson.loads(value)
+        except orjson.JSONDecodeError:
+            # NaN/Infinity and ints wider than 64 bits; the stdlib reads both.
+            return json.loads(value)
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None  # type: ignore
+    try:
+        import msgspec  # type: ignore
+        import msgspec.json as _msgspec_json  # type: ignore
+
+        def _json_loads(value: Any) -> Any:
+            try:
+                return _msgspec_json.decode(value)
+            except msgspec.DecodeError:
+                return json.loads(value)
+    except ImportError:
+        _json_loads = json.loads
+
+
+_first_column = operator.itemgetter(0)
+
+
+# Table and column names are interpolated into SQL, so they must be plain
+# identifiers.
+_IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*\Z")
+
+
+def _close_quietly(conn: sqlite3.Connection) -> None:
+    try:
+        conn.close()
+    except sqlite3.Error:
+        pass
+
+
+def _apply_pragmas(conn: sqlite3.Connection, pragmas: Sequence[str]) -> None:
+    for pragma in pragmas:
+        try:
+            conn.execute(pragma)
+        except sqlite3.OperationalError:
+            pass
+
+
+class _ConnectionPool:
+    """The connections of one database file.
+
+    One read-write connection is shared by all threads, with writes
+    serialised by ``write_lock``.  Each reading thread also gets its own
+    read-only connection, so reads never queue behind writes or reopen the
+    file.  In-memory databases only exist on their own connection, so
+    ``reader_cursor`` returns ``None`` and reads go through the writer.
+    """
+
+    def __init__(self, database: str, pragmas: Sequence[str]) -> None:
+        self.pragmas = tuple(pragmas)
+        self.reader_uri: Optional[str] = None
+        # ``isolation_level=None`` disables the driver's implicit BEGIN:
+        # single statements autocommit inside SQLite and callers issue
+        # explicit BEGIN IMMEDIATE/COMMIT around batches.  The SQL issued per
+        # call comes from prebuilt templates, so a statement cache larger
+        # than sqlite3's default 128 keeps every shape prepared.
+        if isinstance(database, str) and database != ":memory:" and not database.startswith("file:"):
+            # Use a URI to guarantee create (mode=rwc).
+            target = "file:" + urlquote(database) + "?mode=rwc"
+            self.reader_uri = "file:" + urlquote(database) + "?mode=ro"
+            uri = True
+        else:
+            target, uri = database, str(database).startswith("file:")
+        self.writer = self._connect(target, uri)
+        self.write_lock = threading.RLock()
+        # thread ident -> read-only connection owned by that thread
+        self.readers: Dict[int, sqlite3.Connection] = {}
+        self._readers_lock = threading.Lock()
+        self._local = threading.local()
+        self.closed = False
+
+    def _connect(self, target: str, uri: bool) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            target,
+            uri=uri,
+            timeout=10.0,
+            isolation_level=None,
+            cached_statements=256,
+            check_same_thread=False,
+        )
+        _apply_pragmas(conn, self.pragmas)
+        return conn
+
+    def reader_cursor(self) -> Optional[sqlite3.Cursor]:
+        """Return this thread's read-only cursor."""
+        if self.reader_uri is None:
+            return None
+        cur = getattr(self._local, "cursor", None)
+        if cur is None:
+            if self.closed:
+                raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+            conn = self._connect(self.reader_uri, True)
+            ident = threading.get_ident()
+            with self._readers_lock:
+                # Drop connections left behind by threads that have exited.
+                alive = {t.ident for t in threading.enumerate()}
+                for dead in [i for i in self.readers if i not in alive]:
+                    _close_quietly(self.readers.pop(dead))
+                stale = self.readers.pop(ident, None)
+                if stale is not None:
+                    _close_quietly(stale)
+                self.readers[ident] = conn
+            cur = self._local.cursor = conn.cursor()
+        return cur
+
+    def close(self) -> None:
+        """Refresh statistics, checkpoint the WAL and close all connections.
+
+        Safe to call twice.  Readers are closed first so the ``TRUNCATE``
+        checkpoint is not blocked by their snapshots and the ``-wal`` file is
+        reset to zero bytes even if other processes keep the database open.
+        """
+        with self._readers_lock:
+            self.closed = True
+            for reader in self.readers.values():
+                _close_quietly(reader)
+            self.readers.clear()
+        _apply_pragmas(self.writer, ("PRAGMA optimize", "PRAGMA wal_checkpoint(TRUNCATE)"))
+        _close_quietly(self.writer)
+
+
+def _is_transient_io_error(error: sqlite3.OperationalError) -> bool:
+    # Lock waits are handled inside SQLite by ``busy_timeout``; only these
+    # sporadic errors, which some filesystems raise under contention, are
+    # retried from Python.
+    return "disk i/o error" in str(error).lower()
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _json_loads_or_none(value: Any) -> Any:
+    return None if value is None else _json_loads(value)
+
+
+def _type_error(attr: str, expected: type) -> None:
+    raise TypeError(f"Attribute '{attr}' expects value of type {expected.__name__}")
+
+
+@functools.lru_cache(maxsize=256)
+def _select_ids_sql(
+    table: str,
+    filters: Tuple[Tuple[str, Optional[int]], ...],
+    count: bool = False,
+    paged: bool = False,
+) -> str:
+    """Return the ``find_item`` query for ``(attr, arity)`` filters.
+
+    An arity of ``None`` is an equality test, ``n`` an ``IN`` list of ``n``
+    values.  ``count`` selects ``COUNT(*)`` instead of the ids; ``paged``
+    orders by id and appends ``LIMIT ? OFFSET ?``.
+    """
+    sql = f"SELECT {'COUNT(*)' if count else 'id'} FROM {table}"
+    if filters:
+        sql += " WHERE " + " AND ".join(
+            f"{attr} = ?" if arity is None else f"{attr} IN ({', '.join('?' * arity)})"
+            for attr, arity in filters
+        )
+    if paged:
+        sql += " ORDER BY id LIMIT ? OFFSET ?"
+    return sql
+
+
+@functools.lru_cache(maxsize=256)
+def _update_sql(table: str, attrs: Tuple[str, ...]) -> str:
+    """Return the ``set_attrs`` statement updating ``attrs`` of one row."""
+    assignments = ", ".join(f"{attr} = ?" for attr in attrs)
+    return f"UPDATE {table} SET {assignments} WHERE id = ?"
+
+
+def _where_id_in(
+    n_ids: int,
+    filters: Tuple[Tuple[str, Optional[int]], ...],
+    at_most: Tuple[str, ...],
+) -> str:
+    conditions = [f"id IN ({', '.join('?' * n_ids)})"]
+    conditions += [
+        f"{attr} = ?" if arity is None else f"{attr} IN ({', '.join('?' * arity)})"
+        for attr, arity in filters
+    ]
+    conditions += [f"{attr} <= ?" for attr in at_most]
+    return " AND ".join(conditions)
+
+
+@functools.lru_cache(maxsize=256)
+def _update_where_sql(
+    table: str,
+    attrs: Tuple[str, ...],
+    n_ids: int,
+    filters: Tuple[Tuple[str, Optional[int]], ...],
+    at_most: Tuple[str, ...],
+    returning: bool = True,
+) -> str:
+    """Return the ``update_items`` compare-and-set statement.
+
+    ``filters`` follow :func:`_select_ids_sql`; ``at_most`` lists the columns
+    bounded by ``<= ?``.  With ``returning`` the ids of the updated rows are
+    returned (SQLite 3.35+).
+    """
+    assignments = ", ".join(f"{attr} = ?" for attr in attrs)
+    sql = f"UPDATE {table} SET {assignments} WHERE {_where_id_in(n_ids, filters, at_most)}"
+    return sql + " RETURNING id" if returning else sql
+
+
+@functools.lru_cache(maxsize=256)
+def _select_where_sql(
+    table: str,
+    n_ids: int,
+    filters: Tuple[Tuple[str, Optional[int]], ...],
+    at_most: Tuple[str, ...],
+) -> str:
+    """Return the ids :func:`_update_where_sql` would update, for old SQLite."""
+    return f"SELECT id FROM {table} WHERE {_where_id_in(n_ids, filters, at_most)}"
+
+
+@functools.lru_cache(maxsize=256)
+def _top_n_sql(
+    table: str,
+    sort_key: str,
+    largest: bool,
+    filters: Tuple[Tuple[str, Optional[int]], ...],
+) -> str:
+    """Return the ``top_n_by_attr`` query; ``filters`` as for ``find_item``."""
+    sql = _select_ids_sql(table, filters)
+    # ``id`` is a secondary sort key for deterministic ordering
+    direction = "DESC" if largest else "ASC"
+    return f"{sql} ORDER BY {sort_key} {direction}, id ASC LIMIT ?"
+
+
+# Returned by ``DataManager._lookup_attr`` for a missing item.
+_MISSING = object()
+
+
+# ``array`` typecodes for the element types of packed ``list[...]`` columns.
+_PACKED_TYPECODES = {int: "q", float: "d"}
+
+
+def _packed_codec(typecode: str) -> Tuple[Any, Any]:
+    def encode(value: Any) -> bytes:
+        return array.array(typecode, value).tobytes()
+
+    def decode(value: Any) -> Any:
+        return None if value is None else array.array(typecode, value).tolist()
+
+    return encode, decode
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_row_decoder(
+    attrs: Tuple[str, ...], decoders: Tuple[Any, ...], offset: int = 0
+) -> Any:
+    """Generate ``dec(row) -> dict`` mapping ``row[offset:]`` to ``attrs``.
+
+    The counterpart of ``DataManager._compile_row_encoder``: the result is
+    built as one dict literal with each column's decoder inlined.
+    """
+    namespace: Dict[str, Any] = {}
+    items = []
+    for i, (attr, decoder) in enumerate(zip(attrs, decoders)):
+        if decoder is _identity:
+            items.append(f"{attr!r}: r[{i + offset}]")
+        else:
+            namespace[f"d{i}"] = decoder
+            items.append(f"{attr!r}: d{i}(r[{i + offset}])")
+    exec(f"def dec(r):\n    return {{{', '.join(items)}}}", namespace)
+    return namespace["dec"]
+
 
 class DataManagerInterface:
     """Manage a simple SQLite table.
@@ -49,23 +350,125 @@ class DataManagerInterface:
         in-memory database.
     table_name:
         Name of the table to operate on. Defaults to ``"items"``.
+    durability:
+        ``"normal"`` (default) runs file databases in WAL mode with
+        ``synchronous=NORMAL``; ``"full"`` keeps the rollback journal with
+        ``synchronous=FULL`` for maximum crash safety.
+    indexes:
+        Extra indexes to create, each given as a sequence of column names,
+        e.g. ``[("name",), ("status", "end_time")]``.  Declare the columns
+        that ``find_item``/``top_n_by_attr`` filter or sort on so those
+        queries use a B-tree lookup instead of a table scan.
+    auto_index:
+        Also index every ``int``, ``bool`` and ``str`` column that does not
+        already lead one of ``indexes``.  Speeds up equality lookups on any
+        of them at the cost of one extra B-tree update per column on writes.
+    length_indexes:
+        ``str``/``list``/``dict`` columns to give an indexed generated
+        ``length()`` column, so ``top_n_by_attr`` on them reads the index
+        instead of scanning and sorting the table.  Other columns are sorted
+        with ``LENGTH()`` and cost nothing extra on writes.
+    cache_kb:
+        Page cache size per connection in KiB (``PRAGMA cache_size``).
+    mmap_bytes:
+        Maximum number of database bytes to memory-map (``PRAGMA
+        mmap_size``); ``0`` disables memory-mapped I/O.  Every pooled
+        connection maps its own view, so keep this around the size the
+        database file is expected to reach rather than far beyond it.
+    row_cache:
+        Keep up to this many ``get_attr`` results in an in-process LRU
+        cache (``0``, the default, disables it).  Writes through this
+        instance invalidate it, but writes made by other ``DataManager``
+        instances or processes do not, so only enable it when this instance
+        is the sole writer of the table.
     """
 
     TABLE_NAME = "items"
+    DURABILITY_LEVELS = ("normal", "full")
+    # Run ``PRAGMA optimize`` after this many committed writes.
+    OPTIMIZE_INTERVAL = 1000
+    # Bound parameters per ``IN (...)`` query; below SQLite's historical
+    # default limit of 999 host parameters.
+    MAX_IN_PARAMS = 900
+    # Absolute database paths whose directory has already been prepared.
+    _init_cache: set = set()
 
     def __init__(
         self,
         column_type_dict: Dict[str, type],
         database_path: str = "data.db",
         table_name: str = TABLE_NAME,
+        durability: str = "normal",
+        indexes: Sequence[Sequence[str]] = (),
+        auto_index: bool = False,
+        length_indexes: Sequence[str] = (),
+        cache_kb: int = 65536,
+        mmap_bytes: int = 268435456,
+        row_cache: int = 0,
     ) -> None:
+        if durability not in self.DURABILITY_LEVELS:
+            raise ValueError(
+                f"durability must be one of {', '.join(self.DURABILITY_LEVELS)}"
+            )
+        for name in (table_name, *column_type_dict):
+            if not isinstance(name, str) or not _IDENTIFIER.match(name):
+                raise ValueError(f"Invalid SQL identifier: {name!r}")
         self._column_types = dict(column_type_dict)
+        # ``list[int]``/``list[float]`` columns are stored packed; keep their
+        # element typecode and validate values against plain ``list``.
+        self._packed_columns: Dict[str, str] = {}
+        for name, typ in self._column_types.items():
+            if get_origin(typ) is list:
+                args = get_args(typ)
+                if len(args) != 1 or args[0] not in _PACKED_TYPECODES:
+                    raise TypeError(f"Unsupported column type for '{name}': {typ}")
+                self._packed_columns[name] = _PACKED_TYPECODES[args[0]]
+                self._column_types[name] = list
+        self._indexes = [tuple(cols) for cols in indexes]
+        for cols in self._indexes:
+            if not cols:
+                raise ValueError("Index definitions must name at least one column")
+            for col in cols:
+                self._validate_attr(col)
+        if auto_index:
+            leading = {cols[0] for cols in self._indexes}
+            for name, typ in self._column_types.items():
+                if typ in (int, bool, str) and name not in leading:
+                    self._indexes.append((name,))
+        self._cols_frozen = frozenset(self._column_types)
+        self._cols_tuple = tuple(self._column_types)
         self._table_name = table_name
+        # top_n_by_attr orders str/list/dict columns by their length.  For the
+        # columns opted in, an indexed generated column turns that ORDER BY ...
+        # LIMIT into an index range scan instead of a full scan plus sort.
+        self._length_columns: Dict[str, str] = {}
+        for name in length_indexes:
+            if self._validate_attr(name) not in (str, list, dict):
+                raise ValueError(f"length_indexes column '{name}' must be str, list or dict")
+            if f"{name}__len" in self._column_types:
+                raise ValueError(f"Column '{name}__len' clashes with the length index of '{name}'")
+            if sqlite3.sqlite_version_info >= (3, 31, 0):
+                self._length_columns[name] = f"{name}__len"
+        # ``UPDATE ... RETURNING`` needs SQLite 3.35; older builds select the
+        # matching ids first inside the same transaction.
+        self._returning = sqlite3.sqlite_version_info >= (3, 35, 0)
+        self._durability = durability
+        # (id, attr) -> stored value; ``_cache_gen`` is bumped by every
+        # invalidation so a read racing a write does not re-insert old data.
+        self._cache_size = int(row_cache)
+        self._cache: "OrderedDict[Tuple[int, str], Any]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_gen = 0
+        self._cache_kb = int(cache_kb)
+        self._mmap_bytes = int(mmap_bytes)
         # Maintain ``TABLE_NAME`` as an instance attribute for backward
         # compatibility with code that accessed it directly.
         self.TABLE_NAME = self._table_name
 
-        # Normalize path & ensure dir exists
+        # Normalize path & ensure dir exists.  The directory and the
+        # SQLITE_TMPDIR default only need setting up once per file, so
+        # repeated constructions skip the mkdir/environment work while the
+        # file is still there; a deleted file or directory is set up again.
         path = database_path
         if (
             isinstance(path, str)
@@ -73,40 +476,85 @@ class DataManagerInterface:
             and not (path.startswith("file:") and "mode=memory" in path)
         ):
             path = os.path.abspath(path)
-            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            if path not in DataManagerInterface._init_cache or not os.path.exists(path):
+                directory = os.path.dirname(path) or "."
+                os.makedirs(directory, exist_ok=True)
+                # Make sure SQLite temp files go to the same directory
+                # (left alone if already set by the env)
+                if "SQLITE_TMPDIR" not in os.environ:
+                    os.environ["SQLITE_TMPDIR"] = directory
+                DataManagerInterface._init_cache.add(path)
         self._db_path = path
 
-        # Make sure SQLite temp files go to the same directory (when writable)
-        # (safe no-op if already set by the env)
-        try:
-            if isinstance(self._db_path, str) and self._db_path != ":memory:":
-                os.environ.setdefault("SQLITE_TMPDIR", os.path.dirname(self._db_path) or ".")
-        except Exception:
-            pass
-
-        # Open connection; use URI to guarantee create (mode=rwc)
-        if isinstance(self._db_path, str) and self._db_path != ":memory:" and not self._db_path.startswith("file:"):
-            uri = "file:" + urlquote(self._db_path) + "?mode=rwc"
-            self._conn = sqlite3.connect(uri, uri=True, timeout=10.0)
-        else:
-            self._conn = sqlite3.connect(self._db_path, uri=str(self._db_path).startswith("file:"), timeout=10.0)
+        self._pool = _ConnectionPool(
+            self._db_path,
+            (
+                # Always set a generous busy timeout to let SQLite wait for locks
+                "PRAGMA busy_timeout=10000",
+                # A larger page cache and memory-mapped reads serve hot pages
+                # without read() syscalls; temp_store keeps sorts in memory.
+                f"PRAGMA cache_size=-{self._cache_kb}",
+                f"PRAGMA mmap_size={self._mmap_bytes}",
+                "PRAGMA temp_store=MEMORY",
+            ),
+        )
+        self._conn = self._pool.writer
         self._cursor = self._conn.cursor()
+        self._write_lock = self._pool.write_lock
+        self._readers = self._pool.readers
+        # Nesting depth and owning thread of :meth:`transaction`.
+        self._txn_depth = 0
+        self._txn_owner: Optional[int] = None
+        self._writes_since_optimize = 0
+        # Closes the connections on ``close()``, garbage collection or exit.
+        self._finalizer = weakref.finalize(self, self._pool.close)
 
         self._auto_init()
 
+        # The schema is fixed for the lifetime of the instance, so the SQL for
+        # the per-row operations is built once instead of on every call.
+        table = self._table_name
+        columns = ", ".join(self._column_types)
+        placeholders = ", ".join("?" for _ in self._column_types)
+        self._sql_get = {
+            attr: f"SELECT {attr} FROM {table} WHERE id = ?" for attr in self._column_types
+        }
+        self._sql_set = {
+            attr: f"UPDATE {table} SET {attr} = ? WHERE id = ?" for attr in self._column_types
+        }
+        self._sql_insert = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
+        self._sql_delete = f"DELETE FROM {table} WHERE id = ?"
+        self._sql_get_row = f"SELECT {columns} FROM {table} WHERE id = ?"
+
+        # Resolve the storage codec of every column once so encoding and
+        # decoding a value is a single dict lookup plus a call.
+        self._encoders: Dict[str, Any] = {}
+        self._decoders: Dict[str, Any] = {}
+        for attr, typ in self._column_types.items():
+            if attr in self._packed_columns:
+                self._encoders[attr], self._decoders[attr] = _packed_codec(
+                    self._packed_columns[attr]
+                )
+            elif typ is bool:
+                self._encoders[attr], self._decoders[attr] = int, bool
+            elif typ in (list, dict):
+                self._encoders[attr], self._decoders[attr] = _json_dumps, _json_loads_or_none
+            else:
+                self._encoders[attr] = self._decoders[attr] = _identity
+        self._encode_row = self._compile_row_encoder()
+        self._decode_row = _compile_row_decoder(
+            self._cols_tuple, tuple(self._decoders[attr] for attr in self._cols_tuple)
+        )
+
     # ------------------------------------------------------------------
     # One-time initialization (idempotent & safe under concurrency)
     def _auto_init(self) -> None:
-        # Always set a generous busy timeout to let SQLite wait for locks
-        try:
-            self._cursor.execute("PRAGMA busy_timeout=10000")
-        except sqlite3.OperationalError:
-            pass
-
         # Build CREATE TABLE definition from column definitions
         column_defs = ["id INTEGER PRIMARY KEY AUTOINCREMENT"]
         for name, typ in self._column_types.items():
-            if typ is str:
+            if name in self._packed_columns:
+                sql_type = "BLOB"
+            elif typ is str:
                 sql_type = "TEXT"
             elif typ in (int, bool):
                 sql_type = "INTEGER"
@@ -117,6 +565,10 @@ class DataManagerInterface:
             else:
                 raise TypeError(f"Unsupported column type for '{name}': {typ}")
             column_defs.append(f"{name} {sql_type}")
+        for name, len_col in self._length_columns.items():
+            column_defs.append(
+                f"{len_col} INTEGER GENERATED ALWAYS AS (length({name})) VIRTUAL"
+            )
 
         # Skip external locking for in-memory connections
         db_is_memory = (
@@ -128,6 +580,11 @@ class DataManagerInterface:
             self._execute_write_with_retry(
                 f"CREATE TABLE IF NOT EXISTS {self._table_name} ({', '.join(column_defs)})"
             )
+            self._add_missing_length_columns()
+            self._create_indexes()
+            return
+
+        if self._schema_ready():
             return
 
         # Cross-process init lock to serialize first-time initialization
@@ -138,16 +595,26 @@ class DataManagerInterface:
             fcntl.flock(lockfd, fcntl.LOCK_EX)
 
         try:
-            # Pick conservative journal & sync that work on finicky FS
-            # (DELETE+FULL is slower than WAL+NORMAL but very robust.)
-            try:
-                self._cursor.execute("PRAGMA journal_mode=DELETE")
-            except sqlite3.OperationalError:
-                pass
-            try:
-                self._cursor.execute("PRAGMA synchronous=FULL")
-            except sqlite3.OperationalError:
-                pass
+            # WAL lets readers proceed alongside the writer and, together with
+            # synchronous=NORMAL, only fsyncs on checkpoint instead of twice
+            # per commit.  Fall back to DELETE+FULL when WAL is unavailable
+            # (e.g. network filesystems) or full durability was requested.
+            wal_enabled = False
+            if self._durability == "normal":
+                try:
+                    mode = self._cursor.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+                    wal_enabled = str(mode).lower() == "wal"
+                except sqlite3.OperationalError:
+                    pass
+            if wal_enabled:
+                pragmas = ("PRAGMA synchronous=NORMAL", "PRAGMA wal_autocheckpoint=1000")
+            else:
+                pragmas = ("PRAGMA journal_mode=DELETE", "PRAGMA synchronous=FULL")
+            for pragma in pragmas:
+                try:
+                    self._cursor.execute(pragma)
+                except sqlite3.OperationalError:
+                    pass
 
             # Create main & meta tables (idempotent)
             self._execute_write_with_retry(
@@ -166,19 +633,16 @@ class DataManagerInterface:
                 "INSERT OR IGNORE INTO dm_meta (id, wal_enabled) VALUES (1, 0)"
             )
 
-            if "status" in self._column_types and "end_time" in self._column_types:
-                # Index create may still conflict under concurrency -> retry
-                self._execute_write_with_retry(
-                    f"CREATE INDEX IF NOT EXISTS idx_{self._table_name}_status_end "
-                    f"ON {self._table_name}(status, end_time)"
-                )
+            self._add_missing_length_columns()
+            self._create_indexes()
 
             # meta update is best-effort; keep for compatibility
             try:
                 self._cursor.execute(
-                    "UPDATE dm_meta SET initialized_at=strftime('%s','now') WHERE id=1"
+                    "UPDATE dm_meta SET wal_enabled=?, initialized_at=strftime('%s','now') "
+                    "WHERE id=1",
+                    (int(wal_enabled),),
                 )
-                self._conn.commit()
             except sqlite3.OperationalError:
                 pass
         finally:
@@ -186,146 +650,594 @@ class DataManagerInterface:
                 fcntl.flock(lockfd, fcntl.LOCK_UN)
                 os.close(lockfd)
 
+    def _schema_ready(self) -> bool:
+        """Finish setup without the init lock if the file is already set up.
+
+        Reopening an initialised database only needs the per-connection
+        ``synchronous`` setting; the lock, DDL and meta update are skipped
+        when the journal mode, tables and indexes already match.
+        """
+        try:
+            mode = str(self._cursor.execute("PRAGMA journal_mode").fetchone()[0]).lower()
+            names = {
+                row[0]
+                for row in self._cursor.execute(
+                    "SELECT name FROM sqlite_master WHERE type IN ('table', 'index')"
+                )
+            }
+        except sqlite3.OperationalError:
+            return False
+        wanted_mode = "wal" if self._durability == "normal" else "delete"
+        expected = {self._table_name, "dm_meta", *self._index_definitions()}
+        if mode != wanted_mode or not expected <= names:
+            return False
+        synchronous = "NORMAL" if mode == "wal" else "FULL"
+        self._cursor.execute(f"PRAGMA synchronous={synchronous}")
+        return True
+
+    def _add_missing_length_columns(self) -> None:
+        """Add the generated length columns to tables created without them."""
+        if not self._length_columns:
+            return
+        table = self._table_name
+        existing = {row[1] for row in self._cursor.execute(f"PRAGMA table_xinfo({table})")}
+        for name, len_col in list(self._length_columns.items()):
+            if len_col in existing:
+                continue
+            try:
+                self._execute_write_with_retry(
+                    f"ALTER TABLE {table} ADD COLUMN {len_col} INTEGER "
+                    f"GENERATED ALWAYS AS (length({name})) VIRTUAL"
+                )
+            except sqlite3.OperationalError as e:
+                if "duplicate column" not in str(e).lower():
+                    # Unexpected legacy schema; sort with LENGTH() instead.
+                    del self._length_columns[name]
+
+    def _index_definitions(self) -> Dict[str, str]:
+        """Return ``{index name: column list}`` for every index to create."""
+        table = self._table_name
+        definitions = {
+            f"idx_{table}_{len_col}": len_col for len_col in self._length_columns.values()
+        }
+        if "status" in self._column_types and "end_time" in self._column_types:
+            definitions[f"idx_{table}_status_end"] = "status, end_time"
+        for cols in self._indexes:
+            definitions[f"idx_{table}_{'_'.join(cols)}"] = ", ".join(cols)
+        return definitions
+
+    def _create_indexes(self) -> None:
+        """Create the built-in and user-declared indexes (idempotent)."""
+        table = self._table_name
+        for name, columns in self._index_definitions().items():
+            # Index create may still conflict under concurrency -> retry
+            self._execute_write_with_retry(
+                f"CREATE INDEX IF NOT EXISTS {name} ON {table}({columns})"
+            )
+        if self._indexes:
+            # Give the planner statistics for the new indexes; the analysis
+            # limit keeps this cheap on large tables.
+            try:
+                self._cursor.execute("PRAGMA analysis_limit=400")
+                self._execute_write_with_retry(f"ANALYZE {table}")
+            except sqlite3.OperationalError:
+                pass
+
     # ------------------------------------------------------------------
     # Internal helpers
     def _validate_attr(self, attr: str) -> type:
-        if attr not in self._column_types:
-            raise ValueError(f"Unknown attribute '{attr}'")
-        return self._column_types[attr]
+        try:
+            return self._column_types[attr]
+        except KeyError:
+            raise ValueError(f"Unknown attribute '{attr}'") from None
 
     def _encode_value(self, attr: str, value: Any) -> Any:
-        expected = self._validate_attr(attr)
+        try:
+            expected = self._column_types[attr]
+        except KeyError:
+            raise ValueError(f"Unknown attribute '{attr}'") from None
         if not isinstance(value, expected):
-            raise TypeError(
-                f"Attribute '{attr}' expects value of type {expected.__name__}"
-            )
-        if expected is bool:
-            return int(value)
-        if expected in (list, dict):
-            return json.dumps(value)
-        return value
+            _type_error(attr, expected)
+        return self._encoders[attr](value)
+
+    def _compile_row_encoder(self) -> Any:
+        """Generate ``enc(attr_dict) -> tuple`` specialised to this schema.
+
+        The type check and codec of every column are inlined, so encoding a
+        row is one Python call instead of a per-column dispatch loop.  Keys
+        are assumed to have been checked already.
+        """
+        namespace: Dict[str, Any] = {"_type_error": _type_error}
+        lines = ["def enc(d):"]
+        values = []
+        for i, attr in enumerate(self._cols_tuple):
+            namespace[f"t{i}"] = self._column_types[attr]
+            lines.append(f"    v{i} = d[{attr!r}]")
+            lines.append(f"    if not isinstance(v{i}, t{i}): _type_error({attr!r}, t{i})")
+            encoder = self._encoders[attr]
+            if encoder is _identity:
+                values.append(f"v{i}")
+            else:
+                namespace[f"e{i}"] = encoder
+                values.append(f"e{i}(v{i})")
+        lines.append(f"    return ({', '.join(values)}{',' if len(values) == 1 else ''})")
+        exec("\n".join(lines), namespace)
+        return namespace["enc"]
 
     def _decode_value(self, attr: str, value: Any) -> Any:
-        expected = self._validate_attr(attr)
-        if expected is bool:
-            return bool(value)
-        if expected in (list, dict):
-            if value is None:
-                return None
-            return json.loads(value)
-        return value
+        try:
+            decode = self._decoders[attr]
+        except KeyError:
+            raise ValueError(f"Unknown attribute '{attr}'") from None
+        return decode(value)
 
-    def _execute_write_with_retry(self, sql: str, params: tuple = (), max_tries: int = 80):
-        """Execute a write statement with retry on transient locks.
+    def _execute_write_with_retry(
+        self, sql: str, params: Any = (), max_tries: int = 3, many: bool = False
+    ):
+        """Execute a write statement, retrying transient disk I/O errors.
 
-        Retries on 'database is locked', 'database is busy', and transient
-        disk I/O errors which some filesystems surface under high contention.
+        Waiting for other writers is left to SQLite's busy handler
+        (``PRAGMA busy_timeout``), so the common case is a single
+        ``execute`` call.  With ``many`` the statement runs through
+        ``executemany`` over the sequence ``params``.  The returned cursor is
+        private to the caller.
         """
-        delay = 0.05
-        for _ in range(max_tries):
+        execute = self._conn.executemany if many else self._conn.execute
+        with self._write_lock:
+            changes = self._conn.total_changes
             try:
-                cur = self._cursor.execute(sql, params)
-                self._conn.commit()
-                return cur
+                cur = execute(sql, params)
             except sqlite3.OperationalError as e:
-                msg = str(e).lower()
-                if (
-                    "database is locked" in msg
-                    or "database is busy" in msg
-                    or "disk i/o error" in msg
+                # ``executemany`` may have applied some rows before failing;
+                # running it again would apply them twice.
+                if not _is_transient_io_error(e) or (
+                    many and self._conn.total_changes != changes
                 ):
-                    time.sleep(delay)
-                    delay = delay * 1.6 if delay < 0.8 else 0.8
-                    continue
-                raise
-        # last try (propagate if still failing)
-        cur = self._cursor.execute(sql, params)
-        self._conn.commit()
+                    raise
+                cur = self._retry_write(execute, sql, params, max_tries)
+            self._note_write()
         return cur
 
-    def _execute_read_with_retry(self, sql: str, params: tuple = (), max_tries: int = 80):
-        delay = 0.02
+    def _retry_write(self, execute: Any, sql: str, params: Any, max_tries: int):
+        delay = 0.05
         for _ in range(max_tries):
+            time.sleep(delay)
+            delay *= 2
             try:
-                return self._cursor.execute(sql, params)
+                return execute(sql, params)
             except sqlite3.OperationalError as e:
-                msg = str(e).lower()
-                if "locked" in msg or "busy" in msg:
-                    time.sleep(delay)
-                    delay = delay * 1.6 if delay < 0.6 else 0.6
-                    continue
-                raise
-        return self._cursor.execute(sql, params)
+                if not _is_transient_io_error(e):
+                    raise
+        # last try (propagate if still failing)
+        return execute(sql, params)
+
+    def _note_write(self) -> None:
+        """Count a write and periodically let SQLite refresh its statistics."""
+        self._writes_since_optimize += 1
+        if self._writes_since_optimize >= self.OPTIMIZE_INTERVAL and not self._txn_depth:
+            self._writes_since_optimize = 0
+            try:
+                self._cursor.execute("PRAGMA optimize")
+            except sqlite3.OperationalError:
+                pass
+
+    def _reader_cursor(self) -> Optional[sqlite3.Cursor]:
+        """Return this thread's read-only cursor.
+
+        ``None`` means the writer must be used: for in-memory databases and
+        while the calling thread is inside :meth:`transaction`, so it sees its
+        own writes.
+        """
+        if self._txn_owner == threading.get_ident():
+            return None
+        return self._pool.reader_cursor()
+
+    def _execute_read(self, sql: str, params: tuple = ()):
+        # Reads only ever wait on locks, which ``busy_timeout`` absorbs.
+        cur = self._reader_cursor()
+        if cur is None:
+            with self._write_lock:
+                return self._conn.cursor().execute(sql, params)
+        return cur.execute(sql, params)
+
+    def _select_ids(self, sql: str, params: tuple = ()) -> Tuple[int, ...]:
+        """Run a single-column ``SELECT id ...`` and return the ids."""
+        cur = self._reader_cursor()
+        if cur is None:
+            with self._write_lock:
+                return tuple(map(_first_column, self._conn.execute(sql, params)))
+        return tuple(map(_first_column, cur.execute(sql, params)))
+
+    def _invalidate(self, id: Optional[int] = None) -> None:
+        """Drop cached values of item ``id``, or of every item."""
+        if not self._cache_size:
+            return
+        with self._cache_lock:
+            self._cache_gen += 1
+            if id is None:
+                self._cache.clear()
+            else:
+                for attr in self._cols_tuple:
+                    self._cache.pop((id, attr), None)
+
+    def _filter_params(
+        self, required_attributes: Dict[str, Any]
+    ) -> Tuple[Tuple[Tuple[str, Optional[int]], ...], list]:
+        """Return the ``(attr, arity)`` filter key and encoded parameters.
+
+        A ``tuple``, ``set`` or ``frozenset`` value becomes an ``IN`` list of
+        its elements, anything else an equality test.
+        """
+        # Sorting the filter columns maps every key order of the same filter
+        # onto one cached query (and one prepared statement).
+        filters: list[Tuple[str, Optional[int]]] = []
+        params: list[Any] = []
+        encode = self._encode_value
+        for attr in sorted(required_attributes):
+            value = required_attributes[attr]
+            # validate & encode so types/json/bool match stored representation
+            if isinstance(value, (tuple, set, frozenset)):
+                choices = [encode(attr, choice) for choice in value]
+                filters.append((attr, len(choices)))
+                params.extend(choices)
+            else:
+                filters.append((attr, None))
+                params.append(encode(attr, value))
+        return tuple(filters), params
+
+    def _id_chunks(self, ids: Sequence[int]) -> List[Tuple[int, ...]]:
+        """Split ``ids`` into ``IN`` lists of at most ``MAX_IN_PARAMS`` values.
+
+        Each chunk is padded with repeats of its last id up to the next power
+        of two, so batches of any size share a handful of statement shapes
+        (and prepared statements).  Repeated ids do not change an ``IN`` match.
+        """
+        limit = self.MAX_IN_PARAMS
+        chunks = []
+        for start in range(0, len(ids), limit):
+            chunk = tuple(ids[start : start + limit])
+            size = min(1 << (len(chunk) - 1).bit_length(), limit)
+            chunks.append(chunk + chunk[-1:] * (size - len(chunk)))
+        return chunks
+
+    def _row_values(self, attr_dict: Dict[str, Any]) -> Tuple[Any, ...]:
+        """Validate ``attr_dict`` and return its encoded values in column order."""
+        # ``dict_keys`` compares against the frozenset without building a set;
+        # the diagnostic sets are only computed on mismatch.
+        if attr_dict.keys() != self._cols_frozen:
+            missing = self._cols_frozen - attr_dict.keys()
+            extra = attr_dict.keys() - self._cols_frozen
+            problems = []
+            if missing:
+                problems.append(f"missing keys: {', '.join(sorted(missing))}")
+            if extra:
+                problems.append(f"unknown keys: {', '.join(sorted(extra))}")
+            raise ValueError("Invalid attributes: " + "; ".join(problems))
+
+        return self._encode_row(attr_dict)
 
     # ------------------------------------------------------------------
     # Public API
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Group several writes into a single transaction.
+
+        Writes issued inside the ``with`` block are committed together when it
+        exits (one fsync instead of one per statement) and rolled back if it
+        raises.  Nested blocks join the outermost transaction.  Other threads
+        wait for the block to finish before writing.
+        """
+        with self._write_lock:
+            self._txn_depth += 1
+            self._txn_owner = threading.get_ident()
+            try:
+                if self._txn_depth == 1:
+                    self._execute_write_with_retry("BEGIN IMMEDIATE")
+                yield
+            except BaseException:
+                if self._txn_depth == 1 and self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                raise
+            else:
+                if self._txn_depth == 1:
+                    try:
+                        self._execute_write_with_retry("COMMIT")
+                    except BaseException:
+                        # A failed COMMIT (busy, I/O error) leaves the shared
+                        # writer inside the transaction; later autocommit
+                        # writes would silently join it.
+                        if self._conn.in_transaction:
+                            self._conn.execute("ROLLBACK")
+                        raise
+            finally:
+                self._txn_depth -= 1
+                if not self._txn_depth:
+                    self._txn_owner = None
+                    # Reads inside the block may have cached uncommitted data.
+                    self._invalidate()
+
+    def close(self) -> None:
+        """Checkpoint the WAL and close all pooled connections.
+
+        Runs ``PRAGMA optimize`` and ``PRAGMA wal_checkpoint(TRUNCATE)`` first
+        so long-running processes do not leave a large ``-wal`` file behind.
+
+        Called automatically when the instance is garbage collected or the
+        interpreter exits; calling it more than once is harmless.
+        """
+        self._finalizer()
+
+    def __enter__(self) -> "DataManagerInterface":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    CHECKPOINT_MODES = ("PASSIVE", "FULL", "RESTART", "TRUNCATE")
+
+    def checkpoint(self, mode: str = "PASSIVE") -> Tuple[int, int, int]:
+        """Copy committed WAL frames back into the database file.
+
+        Parameters
+        ----------
+        mode:
+            One of ``CHECKPOINT_MODES``; ``"TRUNCATE"`` also resets the
+            ``-wal`` file to zero bytes.
+
+        Returns
+        -------
+        tuple[int, int, int]
+            ``(busy, wal_frames, checkpointed_frames)`` as reported by
+            ``PRAGMA wal_checkpoint``; all ``-1`` when not in WAL mode.
+        """
+        mode = mode.upper()
+        if mode not in self.CHECKPOINT_MODES:
+            raise ValueError(f"mode must be one of {', '.join(self.CHECKPOINT_MODES)}")
+        with self._write_lock:
+            return tuple(self._conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone())
+
     def get_attr(self, id: int, attr: str) -> Any:
         """Return the value of ``attr`` for a given item ``id``."""
-        self._validate_attr(attr)
-        cur = self._execute_read_with_retry(
-            f"SELECT {attr} FROM {self._table_name} WHERE id = ?", (id,)
-        )
-        row = cur.fetchone()
+        value = self._lookup_attr(id, attr)
+        if value is _MISSING:
+            raise ValueError(f"No item with id {id}")
+        return value
+
+    def try_get_attr(self, id: int, attr: str, default: Any = None) -> Any:
+        """Like :meth:`get_attr`, but return ``default`` if ``id`` is missing.
+
+        Callers that expect missing items avoid raising and catching a
+        ``ValueError``.  Unknown attributes still raise.
+        """
+        value = self._lookup_attr(id, attr)
+        return default if value is _MISSING else value
+
+    def _lookup_attr(self, id: int, attr: str) -> Any:
+        # The prepared SQL table doubles as the attribute whitelist.
+        try:
+            sql = self._sql_get[attr]
+        except KeyError:
+            raise ValueError(f"Unknown attribute '{attr}'") from None
+        if not self._cache_size:
+            row = self._execute_read(sql, (id,)).fetchone()
+            if row is None:
+                return _MISSING
+            return self._decoders[attr](row[0])
+
+        key = (id, attr)
+        with self._cache_lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._decoders[attr](self._cache[key])
+            generation = self._cache_gen
+        row = self._execute_read(sql, (id,)).fetchone()
+        if row is None:
+            return _MISSING
+        with self._cache_lock:
+            if generation == self._cache_gen:
+                self._cache[key] = row[0]
+                if len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+        return self._decoders[attr](row[0])
+
+    def get_row(self, id: int) -> Dict[str, Any]:
+        """Return all attributes of item ``id`` as a dict, in one query."""
+        row = self._execute_read(self._sql_get_row, (id,)).fetchone()
         if row is None:
             raise ValueError(f"No item with id {id}")
-        return self._decode_value(attr, row[0])
+        return self._decode_row(row)
+
+    def get_items(
+        self, ids: Iterable[int], attrs: Optional[Sequence[str]] = None
+    ) -> Dict[int, Dict[str, Any]]:
+        """Return ``{id: {attr: value}}`` for several items at once.
+
+        Parameters
+        ----------
+        ids:
+            Item ids to fetch.  Ids that do not exist are left out of the
+            result.
+        attrs:
+            Columns to fetch; all columns when ``None``.
+
+        Rows are read with ``WHERE id IN (...)`` queries of at most
+        ``MAX_IN_PARAMS`` ids each instead of one query per value; see
+        :meth:`_id_chunks`.
+        """
+        attrs = self._cols_tuple if attrs is None else tuple(attrs)
+        if not attrs:
+            raise ValueError("attrs must name at least one column")
+        for attr in attrs:
+            self._validate_attr(attr)
+        decode_row = _compile_row_decoder(
+            attrs, tuple([self._decoders[attr] for attr in attrs]), offset=1
+        )
+        ids = list(dict.fromkeys(ids))
+        result: Dict[int, Dict[str, Any]] = {}
+        columns = ", ".join(attrs)
+        for chunk in self._id_chunks(ids):
+            sql = (
+                f"SELECT id, {columns} FROM {self._table_name} "
+                f"WHERE id IN ({', '.join('?' * len(chunk))})"
+            )
+            for row in self._execute_read(sql, chunk):
+                result[row[0]] = decode_row(row)
+        return result
 
     def set_attr(self, id: int, attr: str, value: Any) -> None:
         """Update ``attr`` for the item ``id`` with ``value``."""
         encoded = self._encode_value(attr, value)
+        cur = self._execute_write_with_retry(self._sql_set[attr], (encoded, id))
+        self._invalidate(id)
+        if cur.rowcount == 0:
+            raise ValueError(f"No item with id {id}")
+
+    def set_attrs(self, id: int, attr_dict: Dict[str, Any]) -> None:
+        """Update several attributes of item ``id`` with one ``UPDATE``."""
+        if not attr_dict:
+            return
+        attrs = tuple(sorted(attr_dict))
+        encode = self._encode_value
+        values = tuple([encode(attr, attr_dict[attr]) for attr in attrs])
         cur = self._execute_write_with_retry(
-            f"UPDATE {self._table_name} SET {attr} = ? WHERE id = ?",
-            (encoded, id),
+            _update_sql(self._table_name, attrs), values + (id,)
         )
+        self._invalidate(id)
         if cur.rowcount == 0:
             raise ValueError(f"No item with id {id}")
 
+    def update_items(
+        self,
+        ids: Iterable[int],
+        attr_dict: Dict[str, Any],
+        where: Optional[Dict[str, Any]] = None,
+        at_most: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[int, ...]:
+        """Update ``attr_dict`` on those ``ids`` that still match a condition.
+
+        The check and the write happen in one ``UPDATE ... RETURNING``
+        statement, so no other writer can change the rows in between.  On
+        SQLite older than 3.35 the matching ids are selected first and then
+        updated inside one ``BEGIN IMMEDIATE`` transaction instead.
+
+        Parameters
+        ----------
+        ids:
+            Candidate item ids; unknown ids are ignored.
+        attr_dict:
+            Attributes to set on every matching item.
+        where:
+            Required attribute values, with the same semantics as
+            :meth:`find_item`.
+        at_most:
+            Upper bounds; an item matches if ``attr <= value``.
+
+        Returns
+        -------
+        tuple of int
+            The ids that were updated, in no particular order.
+        """
+        ids = list(dict.fromkeys(ids))
+        if not ids or not attr_dict:
+            return ()
+        attrs = tuple(sorted(attr_dict))
+        encode = self._encode_value
+        values = tuple([encode(attr, attr_dict[attr]) for attr in attrs])
+        filters, params = self._filter_params(where or {})
+        bounds = tuple(sorted(at_most or {}))
+        params += [encode(attr, at_most[attr]) for attr in bounds]  # pyright: ignore[reportOptionalSubscript]
+        table = self._table_name
+        chunks = self._id_chunks(ids)
+        updated: list[int] = []
+        # RETURNING rows must be drained before another statement runs on
+        # the writer, so the write lock is held across the fetch.
+        single = len(chunks) == 1 and self._returning
+        with self._write_lock if single else self.transaction():
+            for chunk in chunks:
+                if self._returning:
+                    sql = _update_where_sql(table, attrs, len(chunk), filters, bounds)
+                    cur = self._execute_write_with_retry(sql, values + chunk + tuple(params))
+                    updated.extend(map(_first_column, cur))
+                    continue
+                # The transaction keeps other writers out between the two.
+                matched = self._select_ids(
+                    _select_where_sql(table, len(chunk), filters, bounds),
+                    chunk + tuple(params),
+                )
+                for matched_chunk in self._id_chunks(matched):
+                    sql = _update_where_sql(
+                        table, attrs, len(matched_chunk), (), (), returning=False
+                    )
+                    self._execute_write_with_retry(sql, values + matched_chunk)
+                updated.extend(matched)
+        for item_id in updated:
+            self._invalidate(item_id)
+        return tuple(updated)
+
     def add_item(self, attr_dict: Dict[str, Any]) -> int:  # pyright: ignore[reportReturnType]
         """Insert a new item and return its ``id``."""
-        if set(attr_dict) != set(self._column_types):
-            missing = set(self._column_types) - set(attr_dict)
-            extra = set(attr_dict) - set(self._column_types)
-            problems = []
-            if missing:
-                problems.append(f"missing keys: {', '.join(sorted(missing))}")
-            if extra:
-                problems.append(f"unknown keys: {', '.join(sorted(extra))}")
-            raise ValueError("Invalid attributes: " + "; ".join(problems))
+        cur = self._execute_write_with_retry(self._sql_insert, self._row_values(attr_dict))
+        return int(cur.lastrowid)  # pyright: ignore[reportArgumentType]
 
-        columns: Iterable[str] = []
-        placeholders: Iterable[str] = []
-        values: Iterable[Any] = []
-        for attr in self._column_types:
-            columns.append(attr)
-            placeholders.append("?")
-            values.append(self._encode_value(attr, attr_dict[attr]))
+    def add_items(self, attr_dicts: Iterable[Dict[str, Any]]) -> range:
+        """Insert several items in one transaction and return their ``id``s.
 
-        cur = self._execute_write_with_retry(
-            f"INSERT INTO {self._table_name} ({', '.join(columns)}) VALUES ({', '.join(placeholders)})",
-            tuple(values),
-        )
-        return int(cur.lastrowid)  # pyright: ignore[reportArgumentType]
+        All rows are validated before anything is written and inserted with a
+        single ``executemany``, so ``n`` rows cost one commit instead of ``n``.
+        """
+        rows = [self._row_values(attr_dict) for attr_dict in attr_dicts]
+        if not rows:
+            return range(0)
+        with self.transaction():
+            self._execute_write_with_retry(self._sql_insert, rows, many=True)
+            # The write lock is held for the whole transaction, so the new
+            # AUTOINCREMENT ids are consecutive.
+            last_id = self._conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+        return range(last_id - len(rows) + 1, last_id + 1)
 
     def rm_item(self, id: int) -> None:
         """Remove item ``id`` from the database."""
-        cur = self._execute_write_with_retry(
-            f"DELETE FROM {self._table_name} WHERE id = ?", (id,)
-        )
+        cur = self._execute_write_with_retry(self._sql_delete, (id,))
+        self._invalidate(id)
         if cur.rowcount == 0:
             raise ValueError(f"No item with id {id}")
 
+    def rm_items(self, ids: Iterable[int]) -> None:
+        """Remove several items in one transaction.
+
+        Nothing is removed if any of the ``ids`` does not exist.
+        """
+        params = [(id,) for id in dict.fromkeys(ids)]
+        if not params:
+            return
+        with self.transaction():
+            cur = self._execute_write_with_retry(self._sql_delete, params, many=True)
+            if cur.rowcount != len(params):
+                raise ValueError("Some of the given ids do not exist")
+
     def find_item(
         self,
         required_attributes: Optional[Dict[str, Any]] = None,
+        *,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        count_only: bool = False,
         **kwargs: Any,
-    ) -> Tuple[int, ...]:
+    ) -> Union[Tuple[int, ...], int]:
         """Return a tuple of item ids filtered by attribute equality.
 
         Parameters
         ----------
         required_attributes:
             Mapping of column names to required values. If ``None`` or empty, all
-            item ids are returned.
+            item ids are returned.  A ``tuple``, ``set`` or ``frozenset`` value
+            matches any of its elements (``IN (...)``).
+        limit, offset:
+            Return at most ``limit`` ids, ordered by id, after skipping the
+            first ``offset`` matches.
+        count_only:
+            Return the number of matching items as an ``int`` instead of
+            their ids; ``limit`` and ``offset`` are ignored.
 
         Notes
         -----
@@ -339,27 +1251,19 @@ class DataManagerInterface:
             unexpected = ", ".join(sorted(kwargs))
             raise TypeError(f"Unexpected keyword argument(s): {unexpected}")
 
-        if required_attributes is None or len(required_attributes) == 0:
-            cur = self._execute_read_with_retry(f"SELECT id FROM {self.TABLE_NAME}")
-
-            return tuple(row[0] for row in cur.fetchall())
-
-        if not isinstance(required_attributes, dict):
+        if required_attributes is None:
+            required_attributes = {}
+        elif not isinstance(required_attributes, dict):
             raise TypeError("required_attributes must be a dict or None")
 
-        clauses = []
-        values: list[Any] = []
-        for attr, value in required_attributes.items():
-            # validate & encode so types/json/bool match stored representation
-            self._validate_attr(attr)
-            clauses.append(f"{attr} = ?")
-            values.append(self._encode_value(attr, value))
-
-        where = " AND ".join(clauses) if clauses else "1"
-        cur = self._execute_read_with_retry(
-            f"SELECT id FROM {self._table_name} WHERE {where}", tuple(values)
-        )
-        return tuple(row[0] for row in cur.fetchall())
+        key, params = self._filter_params(required_attributes)
+        if count_only:
+            sql = _select_ids_sql(self._table_name, key, count=True)
+            return self._select_ids(sql, tuple(params))[0]
+        if limit is None and offset is None:
+            return self._select_ids(_select_ids_sql(self._table_name, key), tuple(params))
+        params += (-1 if limit is None else limit, offset or 0)
+        return self._select_ids(_select_ids_sql(self._table_name, key, paged=True), tuple(params))
     # from typing import Any, Dict, Optional, Tuple
 
     def top_n_by_attr(
@@ -385,7 +1289,8 @@ class DataManagerInterface:
         required_attributes : dict[str, Any] | None, default=None
             If provided, only rows where every (key == value) pair matches will be considered.
             Values are encoded via the manager's storage rules (e.g., bool -> 0/1,
-            list/dict -> JSON string), same as `find_item`.
+            list/dict -> JSON string), same as `find_item`; a tuple, set or
+            frozenset value matches any of its elements.
         """
         # ``n`` must be a non-negative integer; ``0`` yields an empty result
         if not isinstance(n, int):
@@ -400,38 +1305,24 @@ class DataManagerInterface:
         expected = self._validate_attr(attr)
 
         if expected in (int, float):
-            primary_order = f"{attr} DESC" if largest else f"{attr} ASC"
+            sort_key = attr
         elif expected in (str, list, dict):
-            # For TEXT/list/dict (stored as JSON TEXT), sort by LENGTH
-            primary_order = f"LENGTH({attr}) DESC" if largest else f"LENGTH({attr}) ASC"
+            # For TEXT/list/dict (stored as JSON TEXT), sort by length via the
+            # indexed generated column when the table has one
+            sort_key = self._length_columns.get(attr) or f"LENGTH({attr})"
         else:
             raise TypeError(
                 f"Unsupported type for sorting: {expected.__name__}. "
                 "Must be int, float, str, list, or dict."
             )
 
-        # Build WHERE from required_attributes, encoding values as stored in DB
-        where_parts: list[str] = []
-        params: list[Any] = []
-        if required_attributes:
-            for key, value in required_attributes.items():
-                self._validate_attr(key)  # ensure column exists & type is supported
-                enc_value = self._encode_value(key, value)
-                where_parts.append(f"{key} = ?")
-                params.append(enc_value)
-
-        where_sql = f"WHERE {' AND '.join(where_parts)}" if where_parts else ""
-
-        # Add ``id`` as a secondary sort key for deterministic ordering
-        order_clause = f"{primary_order}, id ASC"
-        sql = (
-            f"SELECT id FROM {self._table_name} {where_sql} "
-            f"ORDER BY {order_clause} LIMIT ?"
-        )
+        # Encode the filter values as stored in the DB; the query text is
+        # cached per (sort key, direction, filter columns) shape.
+        filters, params = self._filter_params(required_attributes or {})
+        sql = _top_n_sql(self._table_name, sort_key, largest, filters)
         params.append(n)
 
-        cur = self._execute_read_with_retry(sql, tuple(params))
-        return tuple(row[0] for row in cur.fetchall())
+        return self._select_ids(sql, tuple(params))
 
 
 # The tests expect a ``DataManager`` class; expose one as an alias.
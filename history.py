@@ -1,61 +1,24 @@
 
 
 import asyncio
+import heapq
 import threading
 import time
-from typing import Any, Callable, Dict, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
 from timer_manager import *
 from data import DataManager
-# if __name__=="__main__":
-#     from timer_manager import *
-# class TimerManagerProxy:
-#     """Proxy for :class:`TimerManager` that dispatches event callbacks."""
-
-#     def __init__(self, manager: TimerManager) -> None:
-#         self._manager = manager
-#         self._callbacks: List[Callable[[str, int], None]] = []
-
-#     def __getattr__(self, name: str) -> Any:  # pragma: no cover - simple delegation
-#         return getattr(self._manager, name)
-
-#     def add_callback(self, callback: Callable[[str, int], None]) -> None:
-#         if callback not in self._callbacks:
-#             self._callbacks.append(callback)
-
-#     def _notify(self, event: str, timer_id: int) -> None:
-#         for cb in list(self._callbacks):
-#             try:
-#                 cb(event, timer_id)
-#             except Exception:
-#                 pass
-
-#     def create_timer(self, name: str, duration: int) -> int:
-#         timer_id = self._manager.create_timer(name, duration)
-#         self._notify("created", timer_id)
-#         return timer_id
-
-#     def rm_timer(self, timer_id: int) -> None:
-#         self._manager.rm_timer(timer_id)
-#         self._notify("deleted", timer_id)
-
-#     def pause_timer(self, timer_id: int) -> None:
-#         self._manager.pause_timer(timer_id)
-#         self._notify("paused", timer_id)
-
-#     def resume_timer(self, timer_id: int) -> None:
-#         self._manager.resume_timer(timer_id)
-#         self._notify("resumed", timer_id)
-
-#     def mark_timer_finished(self, timer_id: int) -> None:
-#         self._manager.mark_timer_finished(timer_id)
-#         self._notify("finished", timer_id)
 
 
 # ---------------------------------------------------------------------------
 # TimerWatcher
 
 
+def _deadline(end_time: float) -> float:
+    """Convert a stored wall-clock ``end_time`` to a monotonic deadline."""
+    return time.monotonic() + (end_time - time.time())
+
+
 class TimerWatcher:
     """Monitor timers managed by :class:`TimerManager`.
 
@@ -69,9 +32,17 @@ class TimerWatcher:
         The :class:`TimerManagerProxy` instance to observe.
     on_finished:
         Callback invoked with ``timer_id`` when a timer reaches its end.  If not
-        provided a simple printer function is used.
+        provided a simple printer function is used.  It fires once per timer,
+        also when the due timer was finished by the proxy or by another
+        process first, but not for a timer finished by hand before its end.
     """
 
+    # Seconds before timers are retried after the database failed to finish them.
+    RETRY_DELAY = 0.5
+    # Tolerance between the proxy's wall-clock ``end_time`` check and the
+    # watcher's monotonic deadline when deciding that a timer was due.
+    CLOCK_SLACK = 0.01
+
     def __init__(
         self,
         manager: TimerManager,
@@ -82,116 +53,185 @@ class TimerWatcher:
         self._on_finished = on_finished or (lambda tid: print(f"Timer {tid} finished"))
 
         # Dedicated asyncio loop in a daemon thread so synchronous code can
-        # continue executing while timers are monitored.  Because SQLite
-        # connections are not thread-safe, the watcher uses its own
-        # :class:`DataManager` instance backed by the same database file.
+        # continue executing while timers are monitored.  The loop thread
+        # shares the manager's :class:`DataManager`: its connection pool is
+        # thread-safe and gives this thread its own read-only connection.
         self._loop = asyncio.new_event_loop()
         self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
         self._thread.start()
-
-        # DataManager for use inside the watcher thread.  It must be constructed
-        # in that thread because SQLite connections are not thread-safe.  A
-        # blocking ``Event`` is used so that ``__init__`` waits until the
-        # connection is ready before proceeding.
-        self._worker_dm: Optional[DataManager] = None
-        ready = threading.Event()
-
-        async def _init_dm() -> None:
-            self._worker_dm = DataManager(
-                {
-                    "duration": float,
-                    "start_time": float,
-                    "end_time": float,
-                    "status": str,
-                    "name": str,
-                },
-                database_path=self._manager.dm._db_path,  # type: ignore[attr-defined]
-            )
-            ready.set()
-
-        asyncio.run_coroutine_threadsafe(_init_dm(), self._loop)
-        ready.wait()
-
-        # Map of timer_id -> Future returned by ``run_coroutine_threadsafe``.
-        self._tasks: Dict[int, asyncio.Future] = {}
+        self._dm: DataManager = self._manager.dm
+
+        # Map of timer_id -> ``time.monotonic()`` deadline of every watched
+        # timer, so waiting needs no database reads until the final check
+        # and is immune to wall-clock steps.
+        self._deadlines: Dict[int, float] = {}
+        # Min-heap of (deadline, timer_id) consumed by the single scheduler
+        # coroutine.  Entries whose deadline no longer matches
+        # ``_deadlines`` are stale and skipped when they reach the top.
+        self._heap: List[Tuple[float, int]] = []
+        self._heap_lock = threading.Lock()
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._scheduler_future = asyncio.run_coroutine_threadsafe(
+            self._scheduler(), self._loop
+        )
 
         # React to timer events via the proxy
         self._proxy.add_callback(self._handle_event) # type: ignore
 
-        # Start watching currently running timers
-        for tid in self._manager.dm.find_item({"status": RUNNING}):
-            self._schedule_watch(int(tid))
+        # Start watching currently running timers (one query for all of them)
+        running = self._dm.find_item({"status": RUNNING})
+        rows = self._dm.get_items(running, ["end_time"])
+        # Read both clocks once for the whole batch and wake the scheduler once
+        offset = time.monotonic() - time.time()
+        self._push_many((tid, row["end_time"] + offset) for tid, row in rows.items())
 
     # ------------------------------------------------------------------
     # Event handling
     def _handle_event(self, event: str, timer_id: int) -> None:
         if event in {"created", "resumed"}:
             self._schedule_watch(timer_id)
-        elif event in {"paused", "deleted", "finished"}:
+        elif event in {"paused", "deleted"}:
             self._cancel_watch(timer_id)
+        elif event == "finished":
+            # The proxy may mark a due timer finished before the watcher wakes
+            # up; report it here so ``on_finished`` still fires once.  A timer
+            # finished early by hand is only unwatched, as before.
+            deadline = self._deadlines.pop(timer_id, None)
+            if deadline is not None and deadline <= time.monotonic() + self.CLOCK_SLACK:
+                self._on_finished(timer_id)
 
     # ------------------------------------------------------------------
-    def _schedule_watch(self, timer_id: int) -> None:
-        if timer_id in self._tasks:
+    def _schedule_watch(self, timer_id: int, end_time: Optional[float] = None) -> None:
+        if timer_id in self._deadlines:
             return
-        coro = self._wait_for_timer(timer_id)
-        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
-        self._tasks[timer_id] = future # type: ignore
-
-    def _cancel_watch(self, timer_id: int) -> None:
-        fut = self._tasks.pop(timer_id, None)
-        if fut is not None:
-            fut.cancel()
-
-    async def _wait_for_timer(self, timer_id: int) -> None:
-        while True:
-            # Retrieve remaining time for the timer
-            try:
-                status = self._worker_dm.get_attr(timer_id, "status") # type: ignore
-                end_time = self._worker_dm.get_attr(timer_id, "end_time") # pyright: ignore[reportOptionalMemberAccess]
-            except ValueError:
-                # Timer no longer exists
+        if end_time is None:
+            end_time = self._dm.try_get_attr(timer_id, "end_time")
+            if end_time is None:
                 return
-            if status != RUNNING:
-                return
-
-            now = time.time()
-            delay = max(0.0, end_time - now)
+        self._push(timer_id, _deadline(end_time))
+
+    def _push(self, timer_id: int, deadline: float) -> None:
+        self._push_many(((timer_id, deadline),))
+
+    def _push_many(self, entries: Iterable[Tuple[int, float]]) -> None:
+        with self._heap_lock:
+            for timer_id, deadline in entries:
+                self._deadlines[timer_id] = deadline
+                heapq.heappush(self._heap, (deadline, timer_id))
+        # Let the scheduler recompute its sleep if this is the new earliest
+        self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _cancel_watch(self, timer_id: int) -> bool:
+        # The heap entry is left in place and discarded once it surfaces.
+        return self._deadlines.pop(timer_id, None) is not None
+
+    def _pop_expired(self) -> Tuple[List[int], Optional[float]]:
+        """Pop every due timer; return them and the next pending deadline."""
+        now = time.monotonic()
+        expired: List[int] = []
+        with self._heap_lock:
+            heap = self._heap
+            while heap:
+                deadline, timer_id = heap[0]
+                if self._deadlines.get(timer_id) != deadline:
+                    heapq.heappop(heap)  # stale entry
+                elif deadline <= now:
+                    heapq.heappop(heap)
+                    expired.append(timer_id)
+                else:
+                    return expired, deadline
+        return expired, None
+
+    async def _scheduler(self) -> None:
+        """Sleep until the earliest deadline, then finish every due timer."""
+        while not self._stopping:
+            self._wakeup.clear()
+            expired, next_deadline = self._pop_expired()
+            if expired:
+                self._finish(expired)
+                continue
+            timeout = None if next_deadline is None else next_deadline - time.monotonic()
             try:
-                await asyncio.sleep(delay)
-            except asyncio.CancelledError:
-                return
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
 
-            # After waiting re-check that the timer is still valid and running
-            try:
-                status = self._worker_dm.get_attr(timer_id, "status") # pyright: ignore[reportOptionalMemberAccess]
-                end_time = self._worker_dm.get_attr(timer_id, "end_time") # pyright: ignore[reportOptionalMemberAccess]
-            except ValueError:
-                return
-            if status != RUNNING:
-                return
+    def _finish(self, timer_ids: List[int]) -> None:
+        try:
+            finished = self._finish_due(timer_ids)
+        except Exception as exc:
+            # e.g. "database is locked" past busy_timeout: retry these timers
+            # shortly instead of letting the scheduler coroutine die.
+            self._loop.call_exception_handler(
+                {"message": "Failed to finish due timers", "exception": exc}
+            )
+            retry = [(tid, self._deadlines[tid]) for tid in timer_ids if tid in self._deadlines]
+            self._loop.call_later(self.RETRY_DELAY, self._retry, retry)
+            return
 
-            if time.time() >= end_time:
-                self._worker_dm.set_attr(timer_id, "status", FINISHED) # pyright: ignore[reportOptionalMemberAccess]
+        for timer_id in finished:
+            if self._deadlines.pop(timer_id, None) is None:
+                # Already reported through the proxy's "finished" event.
+                continue
+            self._report(timer_id, notify=True)
+
+    def _retry(self, entries: List[Tuple[int, float]]) -> None:
+        # Only timers whose deadline has not been cancelled or replaced since.
+        self._push_many(
+            (timer_id, deadline)
+            for timer_id, deadline in entries
+            if self._deadlines.get(timer_id) == deadline
+        )
+
+    def _finish_due(self, timer_ids: List[int]) -> List[int]:
+        """Mark due timers finished; return the ids this call finished."""
+        # Compare-and-set in one UPDATE so a concurrent ``finish_timer`` from
+        # the proxy cannot also win.
+        now = time.time()
+        finished = list(self._manager.mark_timers_finished(timer_ids, due_by=now))
+        pending = set(timer_ids).difference(finished)
+        if pending:
+            rows = self._dm.get_items(pending, ["status", "end_time"])
+            offset = time.monotonic() - now
+            extended: List[Tuple[int, float]] = []
+            for timer_id in pending:
+                row = rows.get(timer_id)
+                if row is None:
+                    self._deadlines.pop(timer_id, None)  # deleted meanwhile
+                elif row["status"] == FINISHED:
+                    # Finished by the proxy, another manager or another
+                    # process.  Whoever pops the deadline first reports it.
+                    if self._deadlines.pop(timer_id, None) is not None:
+                        self._report(timer_id, notify=False)
+                elif row["status"] != RUNNING:
+                    self._deadlines.pop(timer_id, None)
+                elif timer_id in self._deadlines:
+                    # Timer has been extended; wait again for the remaining time
+                    extended.append((timer_id, row["end_time"] + offset))
+            if extended:
+                self._push_many(extended)
+        return finished
+
+    def _report(self, timer_id: int, notify: bool) -> None:
+        try:
+            if notify:
                 # Notify via the proxy so external callbacks fire
                 self._proxy._notify("finished", timer_id) # pyright: ignore[reportAttributeAccessIssue]
-                self._on_finished(timer_id)
-                return
-            # Timer has been extended; loop and wait again for remaining time
+            self._on_finished(timer_id)
+        except Exception as exc:
+            # Keep the scheduler alive for the remaining timers.
+            self._loop.call_exception_handler(
+                {"message": f"Timer {timer_id} callback failed", "exception": exc}
+            )
 
     # ------------------------------------------------------------------
     def stop(self) -> None:
-        """Cancel all tasks and stop the background event loop."""
-        for tid in list(self._tasks):
-            self._cancel_watch(tid)
+        """Stop watching timers and the background event loop."""
+        self._deadlines.clear()
+        self._stopping = True
+        self._loop.call_soon_threadsafe(self._wakeup.set)
+        self._scheduler_future.result()
         self._loop.call_soon_threadsafe(self._loop.stop)
         self._thread.join()
-        try:
-            self._loop.close()
-        finally:
-            try:
-                if self._worker_dm is not None:
-                    self._worker_dm._conn.close()  # type: ignore[attr-defined]
-            except Exception:
-                pass
-
+        self._loop.close()
@@ -0,0 +1,88 @@
+import sqlite3
+
+import pytest
+
+from data import DataManager
+
+
+COLUMN_TYPES = {"name": str, "count": int, "tags": list}
+
+
+def test_add_items_returns_consecutive_ids(tmp_path):
+    dm = DataManager(COLUMN_TYPES, database_path=str(tmp_path / "bulk.db"))
+    first = dm.add_item({"name": "first", "count": 0, "tags": []})
+    ids = dm.add_items(
+        {"name": f"n{i}", "count": i, "tags": [i]} for i in range(1, 4)
+    )
+    assert tuple(ids) == (first + 1, first + 2, first + 3)
+    assert [dm.get_attr(i, "tags") for i in ids] == [[1], [2], [3]]
+    assert dm.add_items([]) == range(0)
+
+
+def test_add_items_validates_before_writing():
+    dm = DataManager(COLUMN_TYPES, database_path=":memory:")
+    with pytest.raises(ValueError):
+        dm.add_items([{"name": "ok", "count": 1, "tags": []}, {"name": "bad"}])
+    assert dm.find_item() == ()
+
+
+def test_transaction_commits_and_rolls_back(tmp_path):
+    db = str(tmp_path / "txn.db")
+    dm = DataManager(COLUMN_TYPES, database_path=db)
+    with dm.transaction():
+        item_id = dm.add_item({"name": "a", "count": 1, "tags": []})
+        dm.set_attr(item_id, "count", 2)
+    assert DataManager(COLUMN_TYPES, database_path=db).get_attr(item_id, "count") == 2
+
+    with pytest.raises(RuntimeError):
+        with dm.transaction():
+            dm.set_attr(item_id, "count", 3)
+            raise RuntimeError("boom")
+    assert dm.get_attr(item_id, "count") == 2
+
+
+def test_rm_items_is_all_or_nothing():
+    dm = DataManager(COLUMN_TYPES, database_path=":memory:")
+    ids = dm.add_items({"name": f"n{i}", "count": i, "tags": []} for i in range(4))
+    with pytest.raises(ValueError):
+        dm.rm_items([ids[0], 999])
+    assert dm.find_item() == tuple(ids)
+    dm.rm_items([ids[0], ids[2], ids[0]])
+    assert dm.find_item() == (ids[1], ids[3])
+
+
+def test_failed_commit_is_rolled_back(monkeypatch):
+    dm = DataManager(COLUMN_TYPES, database_path=":memory:")
+    execute = dm._execute_write_with_retry
+
+    def failing_commit(sql, *args, **kwargs):
+        if sql == "COMMIT":
+            raise sqlite3.OperationalError("database is locked")
+        return execute(sql, *args, **kwargs)
+
+    monkeypatch.setattr(dm, "_execute_write_with_retry", failing_commit)
+    with pytest.raises(sqlite3.OperationalError):
+        with dm.transaction():
+            dm.add_item({"name": "lost", "count": 1, "tags": []})
+    assert not dm._conn.in_transaction
+    monkeypatch.undo()
+    assert dm.find_item() == ()
+    with dm.transaction():
+        dm.add_item({"name": "kept", "count": 2, "tags": []})
+    assert len(dm.find_item()) == 1
+
+
+def test_bulk_writes_go_through_the_write_helper(monkeypatch):
+    dm = DataManager(COLUMN_TYPES, database_path=":memory:")
+    calls = []
+    execute = dm._execute_write_with_retry
+
+    def record(sql, *args, **kwargs):
+        calls.append((sql.split()[0], kwargs.get("many", False)))
+        return execute(sql, *args, **kwargs)
+
+    monkeypatch.setattr(dm, "_execute_write_with_retry", record)
+    ids = dm.add_items({"name": f"n{i}", "count": i, "tags": []} for i in range(3))
+    dm.rm_items(ids)
+    assert ("INSERT", True) in calls and ("DELETE", True) in calls
+    assert dm.find_item() == ()
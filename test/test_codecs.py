@@ -0,0 +1,38 @@
+from data import DataManager
+
+
+COLUMN_TYPES = {
+    "name": str,
+    "count": int,
+    "rating": float,
+    "active": bool,
+    "tags": list,
+    "settings": dict,
+    "samples": list[int],
+}
+ROW = {
+    "name": "a",
+    "count": 1,
+    "rating": 0.5,
+    "active": True,
+    "tags": ["x", 1],
+    "settings": {"k": [1]},
+    "samples": [3, -4],
+}
+
+
+def test_rows_decode_every_column_type():
+    dm = DataManager(COLUMN_TYPES, database_path=":memory:")
+    item_id = dm.add_item(ROW)
+    assert dm.get_row(item_id) == ROW
+    assert dm.get_items([item_id]) == {item_id: ROW}
+    assert dm.get_row(item_id)["active"] is True
+
+
+def test_get_items_decodes_any_column_subset():
+    dm = DataManager(COLUMN_TYPES, database_path=":memory:")
+    item_id = dm.add_item(ROW)
+    for attrs in (["samples"], ["active", "name"], ["settings", "tags", "count"]):
+        for _ in range(2):  # the second call reuses the compiled decoder
+            rows = dm.get_items([item_id], attrs)
+            assert rows == {item_id: {attr: ROW[attr] for attr in attrs}}
@@ -0,0 +1,86 @@
+import threading
+
+import pytest
+
+from data import DataManager
+
+
+COLUMN_TYPES = {"name": str, "count": int}
+
+
+def test_reads_and_writes_from_other_threads(tmp_path):
+    dm = DataManager(COLUMN_TYPES, database_path=str(tmp_path / "pool.db"))
+    item_id = dm.add_item({"name": "a", "count": 0})
+    seen = []
+
+    def worker() -> None:
+        for _ in range(5):
+            with dm.transaction():
+                count = dm.get_attr(item_id, "count")
+                dm.set_attr(item_id, "count", count + 1)
+        seen.append(dm.get_attr(item_id, "name"))
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert seen == ["a"] * 4
+    assert dm.get_attr(item_id, "count") == 20
+    assert len(dm._readers) >= 1
+    dm.close()
+    assert dm._readers == {}
+
+
+def test_close_truncates_wal(tmp_path):
+    db = tmp_path / "wal.db"
+    dm = DataManager(COLUMN_TYPES, database_path=str(db))
+    other = DataManager(COLUMN_TYPES, database_path=str(db))
+    dm.add_items({"name": str(i), "count": i} for i in range(500))
+    wal = tmp_path / "wal.db-wal"
+    assert wal.stat().st_size > 0
+    dm.close()
+    # ``other`` keeps the database open, so only the checkpoint empties it.
+    assert wal.stat().st_size == 0
+    assert len(other.find_item()) == 500
+
+
+def test_reopen_skips_init_lock(tmp_path, monkeypatch):
+    import data
+
+    db = str(tmp_path / "reopen.db")
+    DataManager(COLUMN_TYPES, database_path=db).close()
+    if data.fcntl is None:
+        return
+    calls = []
+    monkeypatch.setattr(data.fcntl, "flock", lambda fd, op: calls.append(op))
+    dm = DataManager(COLUMN_TYPES, database_path=db)
+    assert calls == []
+    assert dm._conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    # A schema change (a new declared index) still goes through the lock.
+    DataManager(COLUMN_TYPES, database_path=db, indexes=[("count",)])
+    assert calls
+
+
+def test_recreates_a_deleted_database_directory(tmp_path):
+    import shutil
+
+    directory = tmp_path / "gone"
+    db = str(directory / "data.db")
+    DataManager(COLUMN_TYPES, database_path=db).close()
+    shutil.rmtree(directory)
+    dm = DataManager(COLUMN_TYPES, database_path=db)
+    assert dm.find_item() == ()
+    dm.close()
+
+
+def test_checkpoint_modes(tmp_path):
+    dm = DataManager(COLUMN_TYPES, database_path=str(tmp_path / "ckpt.db"))
+    dm.add_items({"name": str(i), "count": i} for i in range(100))
+    busy, frames, done = dm.checkpoint()
+    assert busy == 0 and frames == done
+    dm.checkpoint("truncate")
+    assert (tmp_path / "ckpt.db-wal").stat().st_size == 0
+    with pytest.raises(ValueError):
+        dm.checkpoint("bogus")
@@ -1,9 +1,35 @@
 from data import DataManager
 
 
+COLUMN_TYPES = {"name": str, "count": int, "active": bool, "tags": list}
+
+
 def test_find_item_supports_required_attributes_keyword():
     dm = DataManager({"name": str, "count": int}, database_path=":memory:")
     for i in range(3):
         dm.add_item({"name": f"n{i}", "count": i})
     ids = dm.find_item(required_attributes={"name": "n1"})
     assert ids == (2,)
+
+
+def test_find_item_count_and_paging():
+    dm = DataManager(COLUMN_TYPES, database_path=":memory:")
+    ids = dm.add_items(
+        {"name": "n", "count": i, "active": i % 2 == 0, "tags": []} for i in range(6)
+    )
+    assert dm.find_item(count_only=True) == 6
+    assert dm.find_item({"active": True}, count_only=True) == 3
+    assert dm.find_item(limit=2) == (ids[0], ids[1])
+    assert dm.find_item({"active": True}, limit=2, offset=1) == (ids[2], ids[4])
+    assert dm.find_item(offset=4) == (ids[4], ids[5])
+
+
+def test_find_item_matches_any_of_a_tuple():
+    dm = DataManager(COLUMN_TYPES, database_path=":memory:")
+    ids = dm.add_items(
+        {"name": f"n{i % 3}", "count": i, "active": True, "tags": [i]} for i in range(6)
+    )
+    assert dm.find_item({"name": ("n0", "n2")}) == (ids[0], ids[2], ids[3], ids[5])
+    assert dm.find_item({"name": {"n1"}, "count": (1, 2)}) == (ids[1],)
+    assert dm.find_item({"name": ()}) == ()
+    assert dm.find_item({"tags": [4]}) == (ids[4],)  # lists stay plain values
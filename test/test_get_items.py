@@ -0,0 +1,55 @@
+import pytest
+
+from data import DataManager
+
+
+COLUMN_TYPES = {"name": str, "count": int, "active": bool, "tags": list}
+
+
+def test_get_items_fetches_rows_in_bulk(monkeypatch):
+    dm = DataManager(COLUMN_TYPES, database_path=":memory:")
+    monkeypatch.setattr(dm, "MAX_IN_PARAMS", 2)
+    ids = dm.add_items(
+        {"name": f"n{i}", "count": i, "active": i % 2 == 0, "tags": [i]}
+        for i in range(5)
+    )
+    rows = dm.get_items(list(ids) + [999], ["name", "active", "tags"])
+    assert list(rows) == list(ids)
+    assert rows[ids[1]] == {"name": "n1", "active": False, "tags": [1]}
+    assert dm.get_items([ids[0]])[ids[0]]["count"] == 0
+    with pytest.raises(ValueError):
+        dm.get_items(ids, ["missing"])
+
+
+def test_get_row_and_set_attrs():
+    dm = DataManager(COLUMN_TYPES, database_path=":memory:")
+    item_id = dm.add_item({"name": "a", "count": 1, "active": True, "tags": [1]})
+    dm.set_attrs(item_id, {"count": 2, "tags": [], "active": False})
+    assert dm.get_row(item_id) == {"name": "a", "count": 2, "active": False, "tags": []}
+    with pytest.raises(TypeError):
+        dm.set_attrs(item_id, {"count": "x"})
+    with pytest.raises(ValueError):
+        dm.set_attrs(999, {"count": 3})
+    with pytest.raises(ValueError):
+        dm.get_row(999)
+
+
+def test_try_get_attr_returns_default_for_missing_items():
+    dm = DataManager(COLUMN_TYPES, database_path=":memory:", row_cache=4)
+    item_id = dm.add_item({"name": "a", "count": 1, "active": True, "tags": []})
+    assert dm.try_get_attr(item_id, "count") == 1
+    assert dm.try_get_attr(999, "count") is None
+    assert dm.try_get_attr(999, "count", default=-1) == -1
+    with pytest.raises(ValueError):
+        dm.try_get_attr(item_id, "missing")
+
+
+def test_get_items_spans_several_in_queries(monkeypatch):
+    dm = DataManager(COLUMN_TYPES, database_path=":memory:")
+    monkeypatch.setattr(dm, "MAX_IN_PARAMS", 6)
+    ids = dm.add_items(
+        {"name": f"n{i}", "count": i, "active": True, "tags": []} for i in range(9)
+    )
+    # 9 ids take two queries, the second one padded to a larger IN list.
+    rows = dm.get_items(list(ids) + [ids[0]], ["count"])
+    assert rows == {item_id: {"count": i} for i, item_id in enumerate(ids)}
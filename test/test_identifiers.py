@@ -0,0 +1,23 @@
+import pytest
+
+from data import DataManager
+
+
+@pytest.mark.parametrize(
+    "columns, table",
+    [
+        ({"name; DROP TABLE items": str}, "items"),
+        ({"1st": int}, "items"),
+        ({"name": str}, "items WHERE 1"),
+    ],
+)
+def test_rejects_non_identifier_names(columns, table):
+    with pytest.raises(ValueError):
+        DataManager(columns, database_path=":memory:", table_name=table)
+
+
+def test_unknown_attribute_raises_value_error():
+    dm = DataManager({"name": str}, database_path=":memory:")
+    item_id = dm.add_item({"name": "a"})
+    with pytest.raises(ValueError):
+        dm.get_attr(item_id, "missing")
@@ -0,0 +1,71 @@
+import pytest
+
+from data import DataManager
+
+
+def _plan(dm: DataManager, sql: str, params: tuple = ()) -> str:
+    rows = dm._conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    return " ".join(row[-1] for row in rows)
+
+
+def test_declared_indexes_are_used(tmp_path):
+    dm = DataManager(
+        {"name": str, "count": int},
+        database_path=str(tmp_path / "idx.db"),
+        indexes=[("name",), ("count", "name")],
+    )
+    assert "idx_items_name" in _plan(dm, "SELECT id FROM items WHERE name = ?", ("a",))
+    assert "idx_items_count_name" in _plan(dm, "SELECT id FROM items WHERE count = ?", (1,))
+
+
+def test_unknown_index_column_raises():
+    with pytest.raises(ValueError):
+        DataManager({"name": str}, database_path=":memory:", indexes=[("missing",)])
+
+
+def test_auto_index_covers_scalar_columns():
+    dm = DataManager(
+        {"name": str, "count": int, "ratio": float, "tags": list},
+        database_path=":memory:",
+        indexes=[("count", "name")],
+        auto_index=True,
+    )
+    names = {
+        row[0]
+        for row in dm._conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+    }
+    assert {"idx_items_name", "idx_items_count_name"} <= names
+    assert not {"idx_items_count", "idx_items_ratio", "idx_items_tags"} & names
+
+
+def test_status_lookup_uses_covering_index():
+    dm = DataManager(
+        {"status": str, "end_time": float}, database_path=":memory:"
+    )
+    plan = _plan(dm, "SELECT id FROM items WHERE status = ?", ("running",))
+    assert "COVERING INDEX idx_items_status_end" in plan
+
+
+def test_length_columns_only_for_opted_in_columns():
+    dm = DataManager(
+        {"name": str, "status": str, "tags": list},
+        database_path=":memory:",
+        length_indexes=["tags"],
+    )
+    columns = {row[1] for row in dm._conn.execute("PRAGMA table_xinfo(items)")}
+    assert "name__len" not in columns and "status__len" not in columns
+    ids = dm.add_items([
+        {"name": "a", "status": "x", "tags": [1]},
+        {"name": "ccc", "status": "x", "tags": [1, 2, 3]},
+        {"name": "bb", "status": "x", "tags": []},
+    ])
+    assert dm.top_n_by_attr("name", n=1) == (ids[1],)
+    assert dm.top_n_by_attr("tags", n=1) == (ids[1],)
+    if "tags__len" in columns:
+        sql = "SELECT id FROM items ORDER BY tags__len ASC, id ASC LIMIT ?"
+        assert "idx_items_tags__len" in _plan(dm, sql, (1,))
+
+
+def test_length_indexes_reject_numeric_columns():
+    with pytest.raises(ValueError):
+        DataManager({"count": int}, database_path=":memory:", length_indexes=["count"])
@@ -0,0 +1,31 @@
+import json
+import math
+
+from data import DataManager
+
+
+COLUMN_TYPES = {"name": str, "payload": list}
+
+
+def test_json_text_is_canonical_stdlib_output():
+    dm = DataManager(COLUMN_TYPES, database_path=":memory:")
+    value = [1e16, 2**70, "é", {"k": [1, 2]}]
+    item_id = dm.add_item({"name": "a", "payload": value})
+    stored = dm._conn.execute(
+        "SELECT payload FROM items WHERE id = ?", (item_id,)
+    ).fetchone()[0]
+    assert stored == json.dumps(value)
+    assert dm.get_attr(item_id, "payload") == value
+    assert dm.find_item({"payload": value}) == (item_id,)
+
+
+def test_rows_written_in_the_default_format_still_match(tmp_path):
+    dm = DataManager(COLUMN_TYPES, database_path=str(tmp_path / "legacy.db"))
+    dm._conn.executemany(
+        "INSERT INTO items (name, payload) VALUES (?, ?)",
+        [("old", json.dumps([1, 2])), ("nan", json.dumps([float("nan")]))],
+    )
+    (old,) = dm.find_item({"name": "old"})
+    assert dm.find_item({"payload": [1, 2]}) == (old,)
+    (nan,) = dm.find_item({"name": "nan"})
+    assert math.isnan(dm.get_attr(nan, "payload")[0])
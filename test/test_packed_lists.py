@@ -0,0 +1,29 @@
+import pytest
+
+from data import DataManager
+
+
+COLUMN_TYPES = {"name": str, "ids": list[int], "weights": list[float]}
+
+
+def test_packed_list_columns_round_trip():
+    dm = DataManager(COLUMN_TYPES, database_path=":memory:")
+    item_id = dm.add_item({"name": "a", "ids": [1, 2, 3], "weights": [0.5, 1]})
+    assert dm.get_attr(item_id, "ids") == [1, 2, 3]
+    assert dm.get_attr(item_id, "weights") == [0.5, 1.0]
+    stored = dm._conn.execute(f"SELECT ids FROM {dm.TABLE_NAME}").fetchone()[0]
+    assert isinstance(stored, bytes) and len(stored) == 24
+
+    other = dm.add_item({"name": "b", "ids": [7], "weights": []})
+    assert dm.find_item({"ids": [7]}) == (other,)
+    assert dm.top_n_by_attr("ids", 1) == (item_id,)
+
+
+def test_packed_list_rejects_bad_values():
+    dm = DataManager(COLUMN_TYPES, database_path=":memory:")
+    with pytest.raises(TypeError):
+        dm.add_item({"name": "a", "ids": (1, 2), "weights": []})
+    with pytest.raises(TypeError):
+        dm.add_item({"name": "a", "ids": ["x"], "weights": []})
+    with pytest.raises(TypeError):
+        DataManager({"tags": list[str]}, database_path=":memory:")
@@ -32,3 +32,143 @@ def test_proxy_callbacks_on_time(tmp_path):
         end_time = tm.dm.get_attr(tid, "end_time")
         assert fired >= end_time
         assert fired - end_time < 0.5
+
+
+def test_async_callbacks_run_in_order_off_the_caller(tmp_path):
+    import threading
+
+    tm = TimerManager(database_path=str(tmp_path / "async.db"))
+    proxy = TimerManagerProxy(tm, async_callbacks=True)
+    events: List[tuple] = []
+    proxy.add_callback(
+        lambda event, tid: events.append((event, tid, threading.get_ident()))
+    )
+
+    tid = proxy.create_timer("t1", 5)
+    proxy.pause_timer(tid)
+    proxy.flush()
+
+    assert [(event, t) for event, t, _ in events] == [("created", tid), ("paused", tid)]
+    assert all(thread != threading.get_ident() for _, _, thread in events)
+
+
+def test_proxy_tracks_many_timers_without_pool_threads(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    tm = TimerManager(database_path=str(tmp_path / "many.db"))
+    # A single worker used to be held for a whole timer's duration.
+    proxy = TimerManagerProxy(tm, task_pool=ThreadPoolExecutor(max_workers=1))
+    finished: List[int] = []
+    proxy.add_callback(lambda event, tid: event == "finished" and finished.append(tid))
+
+    ids = [proxy.create_timer(f"t{i}", 1) for i in range(5)]
+    time.sleep(1.4)
+    proxy.close()
+
+    assert sorted(finished) == ids
+
+
+def test_proxy_heap_skips_paused_and_loads_running(tmp_path):
+    db = str(tmp_path / "heap.db")
+    tm = TimerManager(database_path=db)
+    early = tm.create_timer("early", 1)
+    late = tm.create_timer("late", 2)
+
+    # Timers created before the proxy are picked up from the database.
+    proxy = TimerManagerProxy(tm)
+    finished: List[int] = []
+    proxy.add_callback(lambda event, tid: event == "finished" and finished.append(tid))
+
+    proxy.pause_timer(early)
+    time.sleep(2.3)
+    assert finished == [late]
+    assert tm.is_timer_paused(early)
+
+    proxy.resume_timer(early)
+    time.sleep(1.3)
+    proxy.close()
+    assert finished == [late, early]
+
+
+def test_finish_timer_leaves_paused_timer_alone(tmp_path):
+    tm = TimerManager(database_path=str(tmp_path / "race.db"))
+    proxy = TimerManagerProxy(tm)
+    events: List[str] = []
+    proxy.add_callback(lambda event, tid: events.append(event))
+
+    tid = proxy.create_timer("t", 5)
+    proxy.pause_timer(tid)
+    # A tracking handle that fired just before the pause must not finish it.
+    proxy.finish_timer(tid)
+
+    assert tm.is_timer_paused(tid)
+    assert events == ["created", "paused"]
+    proxy.close()
+
+
+def test_close_stops_the_proxy_threads(tmp_path):
+    tm = TimerManager(database_path=str(tmp_path / "close.db"))
+    proxy = TimerManagerProxy(tm, async_callbacks=True)
+    events: List[str] = []
+    proxy.add_callback(lambda event, tid: events.append(event))
+    proxy.create_timer("t", 5)
+
+    proxy.close()
+    proxy.close()
+
+    assert events == ["created"]
+    assert proxy._loop.is_closed()
+    assert not proxy._loop_thread.is_alive()
+    assert proxy._dispatcher is not None and not proxy._dispatcher.is_alive()
+
+
+def test_batch_drops_events_of_a_rolled_back_transaction(tmp_path):
+    import pytest
+
+    tm = TimerManager(database_path=str(tmp_path / "rollback.db"))
+    proxy = TimerManagerProxy(tm)
+    events: List[tuple] = []
+    proxy.add_callback(lambda event, tid: events.append((event, tid)))
+
+    with pytest.raises(RuntimeError):
+        with proxy.batch():
+            proxy.create_timer("gone", 1)
+            assert events == []  # held back until the commit
+            raise RuntimeError("boom")
+
+    assert events == []
+    assert tm.dm.find_item() == ()
+    proxy.close()
+
+
+def test_batch_reports_and_tracks_committed_timers(tmp_path):
+    tm = TimerManager(database_path=str(tmp_path / "commit.db"))
+    proxy = TimerManagerProxy(tm, async_callbacks=True)
+    events: List[tuple] = []
+    proxy.add_callback(lambda event, tid: events.append((event, tid)))
+
+    with proxy.batch():
+        first = proxy.create_timer("a", 1)
+        with proxy.batch():
+            second = proxy.create_timer("b", 1)
+        proxy.pause_timer(second)
+    time.sleep(1.3)
+    proxy.flush()
+    proxy.close()
+
+    # Dispatched after the commit, so the proxy could read and time them.
+    assert events == [
+        ("created", first), ("created", second), ("paused", second), ("finished", first)
+    ]
+
+
+def test_close_leaves_a_caller_owned_pool_running(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    pool = ThreadPoolExecutor(max_workers=1)
+    proxy = TimerManagerProxy(
+        TimerManager(database_path=str(tmp_path / "pool.db")), task_pool=pool
+    )
+    proxy.close()
+    assert pool.submit(lambda: 42).result() == 42
+    pool.shutdown()
@@ -0,0 +1,27 @@
+import pytest
+
+from data import DataManager
+
+
+COLUMN_TYPES = {"name": str, "count": int, "active": bool, "tags": list}
+
+
+def test_row_cache_is_invalidated_by_writes(tmp_path):
+    dm = DataManager(COLUMN_TYPES, database_path=str(tmp_path / "c.db"), row_cache=2)
+    item_id = dm.add_item({"name": "a", "count": 1, "active": True, "tags": [1]})
+    assert dm.get_attr(item_id, "tags") == [1]
+    dm.get_attr(item_id, "tags").append(2)  # callers get a fresh copy
+    assert dm.get_attr(item_id, "tags") == [1]
+    dm.set_attr(item_id, "tags", [3])
+    assert dm.get_attr(item_id, "tags") == [3]
+    with pytest.raises(RuntimeError):
+        with dm.transaction():
+            dm.set_attrs(item_id, {"count": 5})
+            assert dm.get_attr(item_id, "count") == 5
+            raise RuntimeError
+    assert dm.get_attr(item_id, "count") == 1
+    dm.get_attr(item_id, "name")
+    assert len(dm._cache) == 2
+    dm.rm_item(item_id)
+    with pytest.raises(ValueError):
+        dm.get_attr(item_id, "name")
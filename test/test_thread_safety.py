@@ -1,13 +1,12 @@
 """Thread-safety tests for :mod:`data` and :class:`TimerManager`."""
 
 import threading
-from typing import Dict
+from typing import Callable, Dict
 
 from data import DataManager
 from timer_manager import TimerManager
 import pytest
 
-print(TimerManager)
 # ---------------------------------------------------------------------------
 # DataManager multi-thread tests
 
@@ -21,8 +20,8 @@ COLUMN_TYPES: Dict[str, type] = {
 }
 
 
-def _dm_worker(idx: int, db_path: str) -> None:
-    dm = DataManager(COLUMN_TYPES, database_path=db_path)
+def _dm_worker(idx: int, get_dm: Callable[[], DataManager]) -> None:
+    dm = get_dm()
     item_id = dm.add_item(
         {
             "name": f"item{idx}",
@@ -40,9 +39,18 @@ def _dm_worker(idx: int, db_path: str) -> None:
     assert dm.find_item({"name": f"item{idx}"}) == ()
 
 
-def test_datamanager_thread_safety_all_methods(tmp_path) -> None:
+@pytest.mark.parametrize("share", [True, False], ids=["shared", "per-thread"])
+def test_datamanager_thread_safety_all_methods(tmp_path, share: bool) -> None:
     db_path = str(tmp_path / "dm_thread.db")
-    threads = [threading.Thread(target=_dm_worker, args=(i, db_path)) for i in range(5)]
+    # A shared instance opens a reader per thread and serializes writes in
+    # its pool; separate instances contend on the file itself (busy_timeout,
+    # write retries and the init lock).
+    if share:
+        shared = DataManager(COLUMN_TYPES, database_path=db_path)
+        get_dm = lambda: shared
+    else:
+        get_dm = lambda: DataManager(COLUMN_TYPES, database_path=db_path)
+    threads = [threading.Thread(target=_dm_worker, args=(i, get_dm)) for i in range(5)]
     for t in threads:
         t.start()
     for t in threads:
@@ -56,8 +64,8 @@ def test_datamanager_thread_safety_all_methods(tmp_path) -> None:
 # TimerManager multi-thread tests
 
 
-def _tm_worker(idx: int, db_path: str) -> None:
-    tm = TimerManager(database_path=db_path)
+def _tm_worker(idx: int, get_tm: Callable[[], TimerManager]) -> None:
+    tm = get_tm()
     timer_id = tm.create_timer(f"timer{idx}", duration=idx + 1)
     assert tm.is_timer_running(timer_id)
     tm.pause_timer(timer_id)
@@ -70,9 +78,15 @@ def _tm_worker(idx: int, db_path: str) -> None:
     assert not tm.is_timer_exists(timer_id)
 
 
-def test_timermanager_thread_safety(tmp_path) -> None:
+@pytest.mark.parametrize("share", [True, False], ids=["shared", "per-thread"])
+def test_timermanager_thread_safety(tmp_path, share: bool) -> None:
     db_path = str(tmp_path / "tm_thread.db")
-    threads = [threading.Thread(target=_tm_worker, args=(i, db_path)) for i in range(4)]
+    if share:
+        shared = TimerManager(database_path=db_path)
+        get_tm = lambda: shared
+    else:
+        get_tm = lambda: TimerManager(database_path=db_path)
+    threads = [threading.Thread(target=_tm_worker, args=(i, get_tm)) for i in range(4)]
     for t in threads:
         t.start()
     for t in threads:
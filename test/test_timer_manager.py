@@ -16,6 +16,23 @@ def test_create_timer_validations(tmp_path):
         tm.create_timer("name", -3)
 
 
+def test_invalid_state_changes_raise(tmp_path):
+    tm = TimerManager(database_path=str(tmp_path / "tm.db"))
+    tid = tm.create_timer("t1", 5)
+    assert not tm.is_timer_paused(tid)
+    with pytest.raises(RuntimeError):
+        tm.resume_timer(tid)
+    tm.pause_timer(tid)
+    assert not tm.is_timer_running(tid)
+    with pytest.raises(RuntimeError):
+        tm.pause_timer(tid)
+    tm.rm_timer(tid)
+    with pytest.raises(ValueError):
+        tm.rm_timer(tid)
+    with pytest.raises(ValueError):
+        tm.pause_timer(tid)
+
+
 def test_pause_resume_and_finish(tmp_path):
     tm = TimerManager(database_path=str(tmp_path / "tm.db"))
     tid = tm.create_timer("t1", 2)
@@ -45,3 +62,108 @@ def test_is_timer_exists_validates_input(tmp_path):
         tm.is_timer_exists(-1)
     with pytest.raises(ValueError):
         tm.is_timer_exists("1")  # type: ignore[arg-type]
+
+
+def test_create_timers_in_bulk(tmp_path):
+    tm = TimerManager(database_path=str(tmp_path / "tm.db"))
+    ids = tm.create_timers([("a", 5), ("b", 10)])
+    assert [tm.get_timer_info(tid)["name"] for tid in ids] == ["a", "b"]
+    assert all(tm.is_timer_running(tid) for tid in ids)
+    with pytest.raises(ValueError):
+        tm.create_timers([("c", 5), ("", 5)])
+    assert tm.dm.find_item(count_only=True) == 2
+
+
+def test_get_timers_reads_many_rows(tmp_path):
+    tm = TimerManager(database_path=str(tmp_path / "tm.db"))
+    ids = tm.create_timers([("a", 5), ("b", 10)])
+    infos = tm.get_timers([*ids, 999])
+    assert list(infos) == list(ids)
+    assert infos[ids[1]] == tm.get_timer_info(ids[1])
+
+
+def test_context_manager_closes_connections(tmp_path):
+    import sqlite3
+
+    with TimerManager(database_path=str(tmp_path / "tm.db")) as tm:
+        tm.create_timer("a", 5)
+    with pytest.raises(sqlite3.ProgrammingError):
+        tm.dm.find_item()
+
+
+def test_batch_commits_or_rolls_back_together(tmp_path):
+    tm = TimerManager(database_path=str(tmp_path / "tm.db"))
+    with tm.batch():
+        first = tm.create_timer("a", 5)
+        tm.pause_timer(first)
+    assert tm.is_timer_paused(first)
+    with pytest.raises(ValueError):
+        with tm.batch():
+            tm.create_timer("b", 5)
+            tm.create_timer("", 5)
+    assert tm.dm.find_item() == (first,)
+
+
+def test_single_writer_id_cache(tmp_path):
+    db = str(tmp_path / "tm.db")
+    existing = TimerManager(database_path=db).create_timer("old", 5)
+    tm = TimerManager(database_path=db, assume_single_writer=True)
+    assert tm.is_timer_exists(existing)
+    ids = tm.create_timers([("a", 5), ("b", 5)])
+    tm.rm_timer(ids[0])
+    assert not tm.is_timer_exists(ids[0]) and tm.is_timer_exists(ids[1])
+    with pytest.raises(RuntimeError):
+        with tm.batch():
+            rolled_back = tm.create_timer("c", 5)
+            raise RuntimeError("boom")
+    assert not tm.is_timer_exists(rolled_back)
+
+    assert tm.is_timer_running(ids[1])
+    tm.pause_timer(ids[1])  # must invalidate the cached status
+    assert tm.is_timer_paused(ids[1])
+
+
+def test_validate_checks_time_fields(tmp_path):
+    db = str(tmp_path / "tm.db")
+    tid = TimerManager(database_path=db).create_timer("a", 5)
+    TimerManager(database_path=db).dm.set_attr(tid, "start_time", 0.0)
+    assert TimerManager(database_path=db).is_timer_running(tid)
+    with pytest.raises(RuntimeError):
+        TimerManager(database_path=db, validate=True).is_timer_running(tid)
+    paused = TimerManager(database_path=db, validate=True)
+    other = paused.create_timer("b", 5)
+    paused.pause_timer(other)
+    assert not paused.is_timer_running(other)
+
+
+def test_validate_is_honoured_under_optimize(tmp_path):
+    import os
+    import subprocess
+    import sys
+
+    script = (
+        "import sys\n"
+        "from timer_manager import TimerManager\n"
+        "tm = TimerManager(database_path=sys.argv[1], validate=True)\n"
+        "tid = tm.create_timer('a', 5)\n"
+        "tm.dm.set_attr(tid, 'start_time', 0.0)\n"
+        "try:\n"
+        "    tm.is_timer_running(tid)\n"
+        "except RuntimeError:\n"
+        "    sys.exit(0)\n"
+        "sys.exit(1)\n"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run(
+        [sys.executable, "-O", "-c", script, str(tmp_path / "opt.db")], cwd=root
+    )
+    assert result.returncode == 0
+
+
+def test_mark_timers_finished_in_bulk(tmp_path):
+    tm = TimerManager(database_path=str(tmp_path / "tm.db"))
+    ids = tm.create_timers([("a", 5), ("b", 5), ("c", 5)])
+    tm.pause_timer(ids[2])
+    assert tm.mark_timers_finished(ids, due_by=time.time()) == ()
+    assert sorted(tm.mark_timers_finished([*ids, 999])) == list(ids)
+    assert tm.mark_timers_finished(ids) == ()
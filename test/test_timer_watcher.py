@@ -54,3 +54,64 @@ def test_watcher_handles_deletion(tmp_path):
     time.sleep(1.2)
     assert finished == []
     watcher.stop()
+
+
+def test_watcher_finishes_many_timers_once_each(tmp_path):
+    db = str(tmp_path / "timers_many.db")
+    tm = TimerManager(database_path=db)
+    proxy = TimerManagerProxy(tm)
+    finished: List[int] = []
+    watcher = TimerWatcher(proxy, finished.append)
+    ids = proxy.create_timers([(f"t{i}", 1) for i in range(20)])
+    time.sleep(1.4)
+    watcher.stop()
+    assert sorted(finished) == list(ids)
+    assert all(tm.dm.get_attr(tid, "status") == FINISHED for tid in ids)
+
+
+def test_watcher_survives_a_database_error(tmp_path):
+    import threading
+
+    tm = TimerManager(database_path=str(tmp_path / "timers_error.db"))
+    proxy = TimerManagerProxy(tm)
+    finished: List[int] = []
+    watcher = TimerWatcher(proxy, finished.append)
+    errors: List[dict] = []
+    watcher._loop.set_exception_handler(lambda loop, context: errors.append(context))
+
+    mark = tm.mark_timers_finished
+    failures = [RuntimeError("database is locked")]
+
+    def flaky(*args, **kwargs):
+        if failures and threading.current_thread() is watcher._thread:
+            raise failures.pop()
+        return mark(*args, **kwargs)
+
+    tm.mark_timers_finished = flaky  # type: ignore[method-assign]
+    first = proxy.create_timer("t1", 1)
+    time.sleep(1.2)
+    second = proxy.create_timer("t2", 1)
+    time.sleep(1.3)
+    watcher.stop()
+
+    assert len(errors) == 1 and not failures
+    assert sorted(finished) == [first, second]
+
+
+def test_watcher_on_finished_rules(tmp_path):
+    db = str(tmp_path / "timers_rules.db")
+    tm = TimerManager(database_path=db)
+    proxy = TimerManagerProxy(tm)
+    finished: List[int] = []
+    watcher = TimerWatcher(proxy, finished.append)
+    early, elsewhere = proxy.create_timers([("early", 1), ("elsewhere", 1)])
+
+    # Finished by hand before its end: unwatched without a callback.
+    proxy.mark_timer_finished(early)
+    # Finished by another manager, so no proxy event: reported when due.
+    TimerManager(database_path=db).mark_timer_finished(elsewhere)
+    time.sleep(1.3)
+    watcher.stop()
+
+    assert finished == [elsewhere]
+    assert watcher._deadlines == {}
@@ -2,7 +2,7 @@
 import pytest
 from data import DataManager  # your data.py
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def dm():
     # columns include types we want to sort on (and one unsupported: bool)
     columns = {
@@ -23,8 +23,7 @@ def dm():
         {"name": "Eveleen", "duration": 40, "rating": 0.5, "tags": [],                "flags": {"a":[1,2,3]},      "active": False},
         {"name": "Dan",     "duration": 5,  "rating": 9.9, "tags": ["x","y","z","w"], "flags": {},                 "active": True},
     ]
-    for r in rows:
-        m.add_item(r)
+    m.add_items(rows)  # one executemany and commit
     return m
 
 
@@ -84,7 +83,7 @@ from typing import Any, Dict, Tuple
 from data import DataManager  # adjust if your module path differs
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def manager() -> DataManager:
     column_types = {
         "name": str,
@@ -98,7 +97,7 @@ def manager() -> DataManager:
     return m
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_ids(manager: DataManager):
     """Insert a small, varied dataset and return the row IDs in insertion order."""
     items = [
@@ -115,7 +114,7 @@ def sample_ids(manager: DataManager):
         {"name": "delta",   "tags": [],                 "meta": {"k": 1, "z": 9},
          "count": 2, "rating": 2.1, "active": True},
     ]
-    ids = tuple(manager.add_item(x) for x in items)
+    ids = tuple(manager.add_items(items))
     return ids
 
 
@@ -178,6 +177,14 @@ def test_no_matches_returns_empty(manager: DataManager, sample_ids: Tuple[int, .
     assert got == ()
 
 
+def test_filter_by_any_of_a_tuple(manager: DataManager, sample_ids: Tuple[int, ...]):
+    got = manager.top_n_by_attr(
+        "count", n=3, largest=True, required_attributes={"name": ("alpha", "delta")}
+    )
+    # counts: alpha(5, idx0), delta(2, idx3)
+    assert got == (sample_ids[0], sample_ids[3])
+
+
 def test_n_larger_than_available(manager: DataManager, sample_ids: Tuple[int, ...]):
     got = manager.top_n_by_attr("count", n=999, largest=True)
     # should just return all IDs in sorted order
@@ -0,0 +1,40 @@
+import pytest
+
+from data import DataManager
+
+
+COLUMN_TYPES = {"name": str, "count": int, "active": bool, "tags": list}
+
+
+@pytest.fixture(params=[True, False], ids=["returning", "select-then-update"])
+def dm(request, monkeypatch):
+    manager = DataManager(COLUMN_TYPES, database_path=":memory:")
+    # ``False`` forces the fallback used on SQLite older than 3.35.
+    monkeypatch.setattr(manager, "_returning", request.param)
+    monkeypatch.setattr(manager, "MAX_IN_PARAMS", 2)
+    return manager
+
+
+def test_update_items_only_touches_matching_rows(dm):
+    ids = dm.add_items(
+        {"name": f"n{i}", "count": i, "active": True, "tags": []} for i in range(5)
+    )
+    dm.set_attr(ids[1], "active", False)
+    updated = dm.update_items(
+        list(ids) + [999], {"name": "done"}, where={"active": True}, at_most={"count": 3}
+    )
+    assert sorted(updated) == [ids[0], ids[2], ids[3]]
+    assert dm.find_item({"name": "done"}) == tuple(sorted(updated))
+    assert dm.update_items(
+        ids, {"name": "x"}, where={"name": ("done", "n9")}, at_most={"count": 0}
+    ) == (ids[0],)
+    assert dm.update_items([], {"name": "x"}) == ()
+
+
+def test_update_items_invalidates_the_row_cache(monkeypatch):
+    dm = DataManager(COLUMN_TYPES, database_path=":memory:", row_cache=16)
+    monkeypatch.setattr(dm, "_returning", False)
+    (item_id,) = dm.add_items([{"name": "a", "count": 1, "active": True, "tags": []}])
+    assert dm.get_attr(item_id, "count") == 1
+    assert dm.update_items([item_id], {"count": 2}, where={"active": True}) == (item_id,)
+    assert dm.get_attr(item_id, "count") == 2
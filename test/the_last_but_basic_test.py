@@ -75,7 +75,7 @@ def test_find_item(sample_manager: DataManager):
         }) for i in range(5)
     ]
     found = sample_manager.find_item()
-    assert set(found) == set(ids)
+    assert sorted(found) == sorted(ids)
 
 
 @pytest.fixture
@@ -171,7 +171,7 @@ def test_find_items(manager: DataManager):
         }))
 
     found_ids = manager.find_item()
-    assert set(found_ids) == set(ids)
+    assert sorted(found_ids) == sorted(ids)
 
 
 DB_FILE = "test_concurrency.db"
@@ -185,35 +185,72 @@ column_types = {
 @pytest.fixture(autouse=True)
 def cleanup_db():
     """在每个测试前清理数据库文件"""
-    if os.path.exists(DB_FILE):
-        os.remove(DB_FILE)
+    for path in (DB_FILE, DB_FILE + "-wal", DB_FILE + "-shm"):
+        if os.path.exists(path):
+            os.remove(path)
     yield
-    if os.path.exists(DB_FILE):
-        os.remove(DB_FILE)
+    for path in (DB_FILE, DB_FILE + "-wal", DB_FILE + "-shm"):
+        if os.path.exists(path):
+            os.remove(path)
 
-def thread_worker(thread_id, loops=50):
+BATCH_SIZE = 25  # rows per commit
+
+def write_rows(dm, prefix, loops, delay=0.0):
+    batch = []
+    for i in range(loops):
+        batch.append({"name": prefix, "count": i})
+        if delay:
+            time.sleep(delay)  # 模拟真实操作延迟
+        if len(batch) == BATCH_SIZE:
+            dm.add_items(batch)
+            batch = []
+    dm.add_items(batch)
+
+def thread_worker(thread_id, dm, loops=50, delay=0.0):
+    # Threads share one DataManager: its pool gives each thread a reader and
+    # serializes the single writer connection.
+    write_rows(dm, f"t{thread_id}", loops, delay)
+
+def own_connection_thread_worker(thread_id, loops=50, delay=0.0):
+    # One DataManager per thread, committing row by row: the writers contend
+    # on the file itself (busy_timeout, write retries, the init lock).
     dm = DataManager(column_types, DB_FILE)
     for i in range(loops):
         dm.add_item({"name": f"t{thread_id}", "count": i})
-        time.sleep(0.005)  # 模拟真实操作延迟
+        if delay:
+            time.sleep(delay)
+    dm.close()
 
-def process_worker(proc_id, loops=50):
+def process_worker(proc_id, loops=50, delay=0.0):
+    # Connections must not cross a fork, so each process opens its own.
     dm = DataManager(column_types, DB_FILE)
-    for i in range(loops):
-        dm.add_item({"name": f"p{proc_id}", "count": i})
-        time.sleep(0.005)
+    write_rows(dm, f"p{proc_id}", loops, delay)
 
 
 def count_rows():
     dm = DataManager(column_types, DB_FILE)
     return len(dm.find_item())
 
-def test_multithread_concurrent_writes():
-    threads = [threading.Thread(target=thread_worker, args=(i,)) for i in range(5)]
+@pytest.mark.parametrize("share", [True, False], ids=["shared", "per-thread"])
+@pytest.mark.parametrize("delay", [0.0, 0.005], ids=["fast", "slow"])
+def test_multithread_concurrent_writes(delay, share):
+    if share:
+        dm = DataManager(column_types, DB_FILE)
+        threads = [
+            threading.Thread(target=thread_worker, args=(i, dm, 50, delay))
+            for i in range(5)
+        ]
+    else:
+        threads = [
+            threading.Thread(target=own_connection_thread_worker, args=(i, 50, delay))
+            for i in range(5)
+        ]
     for t in threads:
         t.start()
     for t in threads:
         t.join()
+    if share:
+        dm.close()
 
     total_rows = count_rows()
     assert total_rows == 5 * 50, f"Expected 250 rows, got {total_rows}"
@@ -11,9 +11,14 @@ coroutine objects.
 from __future__ import annotations
 
 import asyncio
+import heapq
+import math
+import queue
 import threading
 import time
-from typing import Any, Callable, Dict, List, Optional
+import traceback
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Executor
 
 # from history import *
@@ -30,8 +35,15 @@ PyTimer_TABLE_NAME = "PyTimer"
 class TimerManager:
     """Manage simple timers stored in a SQLite database."""
 
+    # ``get_attr`` results kept in memory with ``assume_single_writer=True``
+    ROW_CACHE_SIZE = 1024
+
     def __init__(
-        self, database_path: str = "data.db", table_name: str = PyTimer_TABLE_NAME
+        self,
+        database_path: str = "data.db",
+        table_name: str = PyTimer_TABLE_NAME,
+        assume_single_writer: bool = False,
+        validate: bool = False,
     ) -> None:
         """Create a new ``TimerManager``.
 
@@ -39,6 +51,16 @@ class TimerManager:
         ----------
         database_path: str
             Path to the SQLite database used for storing timers.
+        assume_single_writer: bool
+            Keep the set of existing timer IDs, and the most recently read
+            timer attributes, in memory so :meth:`is_timer_exists` and the
+            status checks usually need no query.  Only valid when no other
+            manager or process writes timers to the database.
+        validate: bool
+            Also check the stored time fields of every timer read for
+            consistency (``end_time - duration == start_time`` while running,
+            sentinel times while paused) and raise ``RuntimeError`` when they
+            are not.  Meant for debugging; honoured under ``python -O`` too.
         """
 
         self.dm = DataManager(
@@ -50,45 +72,91 @@ class TimerManager:
                 "name": str,
             },
             database_path=database_path,
+            # The cache is invalidated by this manager's own writes only.
+            row_cache=self.ROW_CACHE_SIZE if assume_single_writer else 0,
+        )
+        self._ids: Optional[Set[int]] = (
+            set(self.dm.find_item()) if assume_single_writer else None
         )
+        self._validate = validate
 
-    def is_timer_exists(self, timer_id: int) -> bool:
-        """Return ``True`` if ``timer_id`` exists in the database."""
+    def close(self) -> None:
+        """Close the underlying :class:`DataManager`."""
+        self.dm.close()
+
+    def __enter__(self) -> "TimerManager":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @staticmethod
+    def _check_timer_id(timer_id: int) -> None:
         if not isinstance(timer_id, int) or timer_id <= 0:
             raise ValueError("Timer ID must be a positive integer.")
+
+    def _get_row(self, timer_id: int) -> Dict[str, Any]:
+        """Return every column of ``timer_id`` with a single query."""
+        self._check_timer_id(timer_id)
         try:
-            self.dm.get_attr(timer_id, "name")
-            return True
+            return self.dm.get_row(timer_id)
         except ValueError:
-            return False
-
-    def is_timer_running(self, timer_id: int) -> bool:
-        if not self.is_timer_exists(timer_id):
-            raise ValueError("Timer with this ID does not exist.")
-        status = self.dm.get_attr(timer_id, "status")
-        duration = self.dm.get_attr(timer_id, "duration")
-        start_time = self.dm.get_attr(timer_id, "start_time")
-        end_time = self.dm.get_attr(timer_id, "end_time")
-        if end_time - duration != start_time:
+            raise ValueError("Timer with this ID does not exist.") from None
+
+    def _check_running(self, row: Dict[str, Any]) -> bool:
+        if (
+            self._validate
+            and row["status"] == RUNNING
+            and not math.isclose(
+                row["end_time"] - row["duration"], row["start_time"], abs_tol=1e-6
+            )
+        ):
             raise RuntimeError(
                 "The timer's start and end times do not match the duration."
             )
-        return status == RUNNING
+        return row["status"] == RUNNING
+
+    def _check_paused(self, row: Dict[str, Any]) -> bool:
+        if (
+            self._validate
+            and row["status"] == PAUSED
+            and not (
+                row["duration"] >= 0
+                and row["start_time"] == NOT_SET
+                and row["end_time"] == NOT_SET
+            )
+        ):
+            raise RuntimeError("The paused timer's time fields are inconsistent.")
+        return row["status"] == PAUSED
 
-    def is_timer_paused(self, timer_id: int) -> bool:
-        if not self.is_timer_exists(timer_id):
+    def is_timer_exists(self, timer_id: int) -> bool:
+        """Return ``True`` if ``timer_id`` exists in the database."""
+        self._check_timer_id(timer_id)
+        if self._ids is not None:
+            return timer_id in self._ids
+        return self.dm.try_get_attr(timer_id, "status") is not None
+
+    def _get_state(self, timer_id: int) -> Dict[str, Any]:
+        """Return the fields the ``_check_*`` helpers read.
+
+        Only ``status`` is fetched unless ``validate`` needs the time fields.
+        """
+        if self._validate:
+            return self._get_row(timer_id)
+        self._check_timer_id(timer_id)
+        status = self.dm.try_get_attr(timer_id, "status")
+        if status is None:
             raise ValueError("Timer with this ID does not exist.")
-        status = self.dm.get_attr(timer_id, "status")
-        duration = self.dm.get_attr(timer_id, "duration")
-        start_time = self.dm.get_attr(timer_id, "start_time")
-        end_time = self.dm.get_attr(timer_id, "end_time")
-        assert status == PAUSED
-        assert duration >= 0
-        assert start_time == NOT_SET
-        assert end_time == NOT_SET
-        return True
+        return {"status": status}
 
-    def create_timer(self, name: str, duration: int) -> int:
+    def is_timer_running(self, timer_id: int) -> bool:
+        return self._check_running(self._get_state(timer_id))
+
+    def is_timer_paused(self, timer_id: int) -> bool:
+        return self._check_paused(self._get_state(timer_id))
+
+    @staticmethod
+    def _check_timer_args(name: str, duration: int) -> None:
         if not isinstance(name, str) or not isinstance(duration, int):
             raise ValueError("Name must be a string and duration must be an integer.")
         if duration <= 0:
@@ -97,73 +165,174 @@ class TimerManager:
             raise ValueError("Name cannot be empty.")
         if len(name) > 100:
             raise ValueError("Name cannot exceed 100 characters.")
-        this_moment = time.time()
+
+    @staticmethod
+    def _new_timer_row(name: str, duration: int, now: float) -> Dict[str, Any]:
+        # Valid arguments pass one fused test; only the rest pay for the
+        # individual checks that pick the error message.
+        if not (
+            type(name) is str
+            and type(duration) is int
+            and duration > 0
+            and 0 < len(name) <= 100
+        ):
+            TimerManager._check_timer_args(name, duration)
         float_duration = float(duration)
-        timer_id = self.dm.add_item(
-            {
-                "name": name,
-                "duration": float_duration,
-                "start_time": this_moment,
-                "end_time": this_moment + float_duration,
-                "status": RUNNING,
-            }
-        )
+        return {
+            "name": name,
+            "duration": float_duration,
+            "start_time": now,
+            "end_time": now + float_duration,
+            "status": RUNNING,
+        }
+
+    def create_timer(self, name: str, duration: int) -> int:
+        timer_id = self.dm.add_item(self._new_timer_row(name, duration, time.time()))
+        if self._ids is not None:
+            self._ids.add(timer_id)
         return timer_id
 
+    def create_timers(self, timers: Iterable[Tuple[str, int]]) -> range:
+        """Create several running timers at once and return their IDs.
+
+        ``timers`` yields ``(name, duration)`` pairs.  All of them are
+        validated first and then inserted in a single transaction, so either
+        every timer is created or none is.
+        """
+        now = time.time()
+        timer_ids = self.dm.add_items(
+            [self._new_timer_row(name, duration, now) for name, duration in timers]
+        )
+        if self._ids is not None:
+            self._ids.update(timer_ids)
+        return timer_ids
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Group several timer operations into one SQLite transaction.
+
+        ``with tm.batch():`` commits every create, pause, resume or delete in
+        the block at once when it exits and rolls them all back if it raises.
+        """
+        try:
+            with self.dm.transaction():
+                yield
+        except BaseException:
+            if self._ids is not None:
+                # The rollback may have undone creates/deletes already cached
+                self._ids = set(self.dm.find_item())
+            raise
+
     def rm_timer(self, timer_id: int) -> None:
-        assert self.is_timer_exists(timer_id)
-        self.dm.rm_item(timer_id)
+        self._check_timer_id(timer_id)
+        try:
+            self.dm.rm_item(timer_id)
+        except ValueError:
+            raise ValueError("Timer with this ID does not exist.") from None
+        if self._ids is not None:
+            self._ids.discard(timer_id)
 
     def pause_timer(self, timer_id: int) -> None:
-        assert self.is_timer_exists(timer_id)
-        assert self.is_timer_running(timer_id)
-        end_time = self.dm.get_attr(timer_id, "end_time")
-        remaining = end_time - time.time()
-        self.dm.set_attr(timer_id, "duration", remaining)
-        self.dm.set_attr(timer_id, "start_time", NOT_SET)
-        self.dm.set_attr(timer_id, "end_time", NOT_SET)
-        self.dm.set_attr(timer_id, "status", PAUSED)
+        # One transaction: the status change commits (and syncs) once, and no
+        # other writer can observe the timer half-paused.
+        with self.dm.transaction():
+            row = self._get_row(timer_id)
+            if not self._check_running(row):
+                raise RuntimeError("Only a running timer can be paused.")
+            self.dm.set_attrs(
+                timer_id,
+                {
+                    "duration": row["end_time"] - time.time(),
+                    "start_time": NOT_SET,
+                    "end_time": NOT_SET,
+                    "status": PAUSED,
+                },
+            )
 
     def resume_timer(self, timer_id: int) -> None:
-        assert self.is_timer_exists(timer_id)
-        assert self.is_timer_paused(timer_id)
-        duration = self.dm.get_attr(timer_id, "duration")
-        if duration < 0:
-            raise ValueError("Cannot resume a timer with negative duration.")
-        start_time = time.time()
-        end_time = start_time + duration
-        self.dm.set_attr(timer_id, "start_time", start_time)
-        self.dm.set_attr(timer_id, "end_time", end_time)
-        self.dm.set_attr(timer_id, "status", RUNNING)
+        # Same shape as ``pause_timer``: one read and one ``UPDATE``.
+        with self.dm.transaction():
+            row = self._get_row(timer_id)
+            if not self._check_paused(row):
+                raise RuntimeError("Only a paused timer can be resumed.")
+            duration = row["duration"]
+            if duration < 0:
+                raise ValueError("Cannot resume a timer with negative duration.")
+            start_time = time.time()
+            self.dm.set_attrs(
+                timer_id,
+                {
+                    "start_time": start_time,
+                    "end_time": start_time + duration,
+                    "status": RUNNING,
+                },
+            )
 
     # ------------------------------------------------------------------
-    def mark_timer_finished(self, timer_id: int) -> None:
+    def mark_timer_finished(self, timer_id: int) -> bool:
         """Mark ``timer_id`` as finished.
 
         The timer is not removed from the database; only its ``status`` field is
         updated.  ``TimerWatcher`` calls this when a timer reaches its end.
+
+        Returns
+        -------
+        bool
+            ``True`` if this call changed the status, ``False`` if the timer
+            does not exist or was already finished.
         """
 
-        if not self.is_timer_exists(timer_id):
-            return
-        # Only running timers can transition to finished
-        status = self.dm.get_attr(timer_id, "status")
-        if status == FINISHED:
-            return
-        self.dm.set_attr(timer_id, "status", FINISHED)
+        return bool(self.mark_timers_finished((timer_id,)))
+
+    def mark_timers_finished(
+        self, timer_ids: Iterable[int], due_by: Optional[float] = None
+    ) -> Tuple[int, ...]:
+        """Mark many timers as finished with a single ``UPDATE``.
+
+        Parameters
+        ----------
+        timer_ids:
+            Timers to finish; unknown or already finished ones are skipped.
+        due_by:
+            If given, only running timers whose ``end_time`` is at most
+            ``due_by`` are finished.
+
+        Returns
+        -------
+        tuple of int
+            The IDs whose status this call changed, in no particular order.
+        """
+        # Check and update in one statement so concurrent callers cannot both win
+        if due_by is None:
+            return self.dm.update_items(
+                timer_ids, {"status": FINISHED}, where={"status": (RUNNING, PAUSED)}
+            )
+        return self.dm.update_items(
+            timer_ids,
+            {"status": FINISHED},
+            where={"status": RUNNING},
+            at_most={"end_time": due_by},
+        )
 
     def get_timer_info(self, timer_id: int) -> Dict[str, Any]:
-        if not self.is_timer_exists(timer_id):
-            raise ValueError("Timer with this ID does not exist.")
+        row = self._get_row(timer_id)
         return {
             "id": timer_id,
-            "name": self.dm.get_attr(timer_id, "name"),
-            "duration": self.dm.get_attr(timer_id, "duration"),
-            "start_time": self.dm.get_attr(timer_id, "start_time"),
-            "end_time": self.dm.get_attr(timer_id, "end_time"),
-            "status": self.dm.get_attr(timer_id, "status"),
+            "name": row["name"],
+            "duration": row["duration"],
+            "start_time": row["start_time"],
+            "end_time": row["end_time"],
+            "status": row["status"],
         }
 
+    def get_timers(self, timer_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        """Return ``get_timer_info``-style dicts for many timers in one query.
+
+        IDs that do not exist are left out of the result.
+        """
+        rows = self.dm.get_items(timer_ids)
+        return {timer_id: {"id": timer_id, **row} for timer_id, row in rows.items()}
+
     def top_n_by_attr(self, attr: str, n: int, largest: bool = True) -> tuple[int, ...]:
         """Return the top N timer IDs sorted by the specified attribute.
 
@@ -197,133 +366,290 @@ class TimerManager:
         return self.dm.top_n_by_attr(
             "end_time", number, largest=False, required_attributes={"status": RUNNING}
         )
-        # running_time r =[id for id in latest_timers if self.is_timer_running(id)]
-        # running_timer..
-        # sort()
-
-
-# class TimerWatcher2:
-#     def __init__(self,timer_manager:TimerManager=TimerManager(),call_back:function=lambda **args:return args ) -> None:
-#         """ check which timer is finished and call the callback function"""
-#         self.dm=timer_manager
-
-#         self.watching_list=
-print(TimerManager)
 
 
 class TimerManagerProxy:
     """Proxy for :class:`TimerManager` that dispatches event callbacks."""
 
+    _DELEGATED = (
+        "is_timer_exists",
+        "is_timer_running",
+        "is_timer_paused",
+        "get_timer_info",
+        "get_timers",
+        "top_n_by_attr",
+        "timers_about_finishing",
+    )
+
     def __init__(
-        self, manager: TimerManager, task_pool: Optional[Executor] = None
+        self,
+        manager: TimerManager,
+        task_pool: Optional[Executor] = None,
+        async_callbacks: bool = False,
     ) -> None:
+        """Wrap ``manager`` so its state changes notify callbacks.
+
+        Parameters
+        ----------
+        manager:
+            The :class:`TimerManager` to wrap.
+        task_pool:
+            Executor running the tracking callback (``finish_timer``) once the
+            tracked timer is due, so it never blocks the proxy's timing loop.
+        async_callbacks:
+            Queue events and run the callbacks on a background thread, so a
+            slow callback (e.g. one persisting an audit log) does not delay
+            ``create_timer``/``pause_timer``.  Callbacks still run one at a
+            time in event order; :meth:`flush` waits for the queue to drain.
+        """
         self._manager = manager
-        self._callbacks: List[Callable[[str, int], None]] = []
+        # Rebuilt on every ``add_callback`` so ``_notify`` can iterate it
+        # without taking a snapshot copy.
+        self._callbacks: Tuple[Callable[[str, int], None], ...] = ()
+        # ``None`` on the queue tells the dispatcher thread to exit.
+        self._events: Optional["queue.Queue[Optional[Tuple[str, int]]]"] = None
+        self._dispatcher: Optional[threading.Thread] = None
+        # ``events`` is the list buffering this thread's events inside
+        # :meth:`batch`, ``None`` outside one.
+        self._batch_local = threading.local()
+        if async_callbacks:
+            self._events = queue.Queue()
+            self._dispatcher = threading.Thread(target=self._dispatch_loop, daemon=True)
+            self._dispatcher.start()
+        # Calls that emit no events go straight to the manager's bound
+        # methods instead of through a per-call ``__getattr__`` lookup.
+        self.dm = manager.dm
+        for name in self._DELEGATED:
+            setattr(self, name, getattr(manager, name))
+        # Only a pool created here is shut down by :meth:`close`.
+        self._owns_pool = task_pool is None
         self.task_pool = task_pool or ThreadPoolExecutor(max_workers=4)
-        self.task = None
+        # One asyncio loop times the tracked timer with ``call_at`` instead of
+        # a pool thread sleeping for the whole duration.  ``self.task`` is the
+        # pending ``TimerHandle`` and is only touched on the loop thread.
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._loop_thread.start()
+        self.task: Optional[asyncio.TimerHandle] = None
+        # Bound once rather than on every re-arm of the tracking task.
+        self._finish_cb: Callable[[int], None] = self.finish_timer
+        # ``(end_time, timer_id)`` currently armed in ``self.task``.
+        self._tracked: Optional[Tuple[float, int]] = None
+
+        # In-memory min-heap of running timers so finding the next one to
+        # track is a peek instead of a query per event.  ``_end_times`` maps
+        # timer_id -> end_time; heap entries that no longer match it are
+        # stale and dropped once they surface (lazy deletion).
+        running = self.dm.find_item({"status": RUNNING})
+        self._end_times: Dict[int, float] = {
+            timer_id: row["end_time"]
+            for timer_id, row in self.dm.get_items(running, ["end_time"]).items()
+        }
+        self._heap: List[Tuple[float, int]] = [
+            (end_time, timer_id) for timer_id, end_time in self._end_times.items()
+        ]
+        heapq.heapify(self._heap)
+        self._heap_lock = threading.Lock()
+
         self.new_tracking_task()
         self.add_callback(self._handle_event)
 
-        # Track the closest timers that are about to finish
-        # self.the_closest_timers: Optional[int] = None
     def _handle_event(self, event: str, timer_id: int) -> None:
-        """Handle timer events and update tracking_task."""
-        if event == "created":
-            # If a new timer will finish sooner than the currently tracked
-            # one, or if no timer is being tracked, start a new waiting task.
-            end_time = self._manager.dm.get_attr(timer_id, "end_time")
-            if not self.the_closest_timers:
-                self.new_tracking_task()
-            else:
-                current_end = self._manager.dm.get_attr(
-                    self.the_closest_timers[0], "end_time"
-                )
-                if end_time < current_end:
-                    self.new_tracking_task()
-        elif event == "deleted":
-            # If the deleted timer was the closest, update tracking_task
-            if timer_id in self.the_closest_timers:
-                self.new_tracking_task()
-        elif event == "finished":
-            # If a timer finished, update tracking_task
-            self.new_tracking_task()
+        """Keep the running-timer heap in sync and retrack its earliest entry.
+
+        Only events that can change the earliest timer re-arm the tracking
+        task: a timer ending before the tracked one, or the tracked timer
+        itself going away.
+        """
+        tracked = self._tracked
+        if event in ("created", "resumed"):
+            end_time = self.dm.try_get_attr(timer_id, "end_time")
+            if end_time is None:
+                return
+            with self._heap_lock:
+                self._end_times[timer_id] = end_time
+                heapq.heappush(self._heap, (end_time, timer_id))
+            if tracked is not None and (end_time, timer_id) > tracked:
+                return
+        elif event in ("paused", "deleted", "finished"):
+            with self._heap_lock:
+                if self._end_times.pop(timer_id, None) is None:
+                    return
+            if tracked is not None and timer_id != tracked[1]:
+                # Dropped lazily once it reaches the top of the heap.
+                return
+        else:
+            return
+        self.new_tracking_task()
+
+    def _peek(self) -> Optional[Tuple[float, int]]:
+        """Return the earliest live ``(end_time, timer_id)`` in the heap."""
+        with self._heap_lock:
+            heap = self._heap
+            while heap:
+                end_time, timer_id = heap[0]
+                if self._end_times.get(timer_id) == end_time:
+                    return heap[0]
+                heapq.heappop(heap)  # stale entry
+        return None
 
     def new_tracking_task(self) -> None:
         """Start waiting on the next timer about to finish.
 
-        If there are no running timers, any existing waiting task is cancelled
+        The earliest running timer is read from the in-memory heap on the
+        proxy's loop thread, so concurrent events cannot arm an out-of-date
+        timer.  If there are no running timers, any pending wait is cancelled
         and the proxy simply idles until a new timer is created.
         """
-
-        """Start waiting for the next timer to finish.
-
-        If there are no running timers any existing waiting task is
-        cancelled to avoid holding on to stale futures.  Otherwise the
-        closest timer is scheduled and will trigger ``finish_timer`` when
-        complete.
-        """
-        self.the_closest_timers = self._manager.timers_about_finishing()
-        if not self.the_closest_timers:
-            if self.task is not None:
-                self.task.cancel()
-                self.task = None
-            return
-
-        # When no timers are active, stop tracking.
-        if not self.the_closest_timers:
-            if self.task is not None:
-                self.task.cancel()
-                self.task = None
-            return
-
-        self.wait_timer(
-            self.the_closest_timers[0],
-            call_back=lambda timer_id: self.finish_timer(timer_id),
-        )
+        self._loop.call_soon_threadsafe(self._retrack)
 
     def wait_timer(self, timer_id: int, call_back: Optional[Callable] = None) -> None:
 
         if call_back is None:
             raise ValueError("call_back function is required")
-        assert self._manager.is_timer_exists(timer_id)
+        end_time = self.dm.try_get_attr(timer_id, "end_time")
+        if end_time is None:
+            raise ValueError("Timer with this ID does not exist.")
+        self._loop.call_soon_threadsafe(self._schedule, timer_id, end_time, call_back)
+
+    # The helpers below run on the proxy's event loop thread.
+    def _retrack(self) -> None:
+        closest = self._peek()
+        if closest is None:
+            self._cancel_task()
+        elif closest != self._tracked:
+            end_time, timer_id = closest
+            self._schedule(timer_id, end_time, self._finish_cb)
+            if self.task is not None:
+                self._tracked = closest
+
+    def _cancel_task(self) -> None:
+        self._tracked = None
         if self.task is not None:
             self.task.cancel()
+            self.task = None
 
-        def waiting_task(
-            timer_id=timer_id, end_time=self._manager.dm.get_attr(timer_id, "end_time")
-        ):
-            import time
+    def _schedule(self, timer_id: int, end_time: float, call_back: Callable) -> None:
+        self._cancel_task()
+        self._arm(timer_id, end_time, call_back)
 
-            while end_time - time.time() > 0:
-                time.sleep(end_time - time.time())
+    def _arm(self, timer_id: int, end_time: float, call_back: Callable) -> None:
+        remaining = end_time - time.time()
+        if remaining > 0:
+            self.task = self._loop.call_later(
+                remaining, self._arm, timer_id, end_time, call_back
+            )
+        else:
+            self.task = None
+            self._tracked = None
+            self.task_pool.submit(call_back, timer_id)
 
-        self.task = self.task_pool.submit(waiting_task)
-        self.task.add_done_callback(lambda f: call_back(timer_id))
+    def close(self) -> None:
+        """Stop the proxy's threads and close the wrapped manager.
+
+        Events already queued with ``async_callbacks`` are dispatched first.
+        Calling it again is harmless.
+        """
+        if self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self._cancel_task)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop_thread.join()
+        self._loop.close()
+        if self._dispatcher is not None and self._events is not None:
+            self._events.put(None)
+            if threading.current_thread() is not self._dispatcher:
+                self._dispatcher.join()
+        if self._owns_pool:
+            self.task_pool.shutdown(wait=False)
+        self._manager.close()
 
     def finish_timer(self, timer_id: int) -> None:
         """Mark a timer as finished and notify callbacks."""
-        if not self._manager.is_timer_exists(timer_id):
+        end_time = self.dm.try_get_attr(timer_id, "end_time")
+        if end_time is None:
+            # Removed behind the proxy's back; stop tracking it.
+            with self._heap_lock:
+                dropped = self._end_times.pop(timer_id, None) is not None
+            if dropped:
+                self.new_tracking_task()
             raise ValueError("Timer with this ID does not exist.")
-        end_time = self._manager.dm.get_attr(timer_id, "end_time")
-        assert end_time < time.time(), "Cannot finish a timer that has not yet ended."
-        self._manager.mark_timer_finished(timer_id)
+        if end_time >= time.time():
+            raise RuntimeError("Cannot finish a timer that has not yet ended.")
+        # Compare-and-set: a timer paused after its handle fired is left alone.
+        changed = bool(
+            self._manager.mark_timers_finished((timer_id,), due_by=time.time())
+        )
+        # Drop this entry even if the timer was finished elsewhere, so it is
+        # not tracked again; the "finished" event below then finds nothing to
+        # retrack.  A resume since the read has pushed a new end_time: keep it.
+        with self._heap_lock:
+            if self._end_times.get(timer_id) == end_time:
+                del self._end_times[timer_id]
         self.new_tracking_task()
 
-        self._notify("finished", timer_id)
-
-    def __getattr__(self, name: str) -> Any:  # pragma: no cover - simple delegation
-        return getattr(self._manager, name)
+        if changed:
+            self._notify("finished", timer_id)
 
     def add_callback(self, callback: Callable[[str, int], None]) -> None:
         if callback not in self._callbacks:
-            self._callbacks.append(callback)
+            self._callbacks += (callback,)
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Group timer operations into one transaction, like ``TimerManager.batch``.
+
+        Events of the operations in the block are held back until the
+        outermost block commits and dropped if it rolls back, so callbacks
+        (and the proxy's own tracking) never see uncommitted timers.
+        """
+        local = self._batch_local
+        if getattr(local, "events", None) is not None:
+            with self._manager.batch():
+                yield
+            return
+        local.events = pending = []
+        try:
+            with self._manager.batch():
+                yield
+        finally:
+            local.events = None
+        for event, timer_id in pending:
+            self._notify(event, timer_id)
 
     def _notify(self, event: str, timer_id: int) -> None:
-        for cb in list(self._callbacks):
-            # try:
+        pending = getattr(self._batch_local, "events", None)
+        if pending is not None:
+            pending.append((event, timer_id))
+            return
+        if self._events is not None:
+            self._events.put((event, timer_id))
+            return
+        for cb in self._callbacks:
             cb(event, timer_id)
-            # except Exception: 
-            # pass
+
+    def _dispatch_loop(self) -> None:
+        events = self._events
+        assert events is not None
+        while True:
+            item = events.get()
+            if item is None:
+                events.task_done()
+                return
+            event, timer_id = item
+            try:
+                for cb in self._callbacks:
+                    cb(event, timer_id)
+            except Exception:
+                # Keep dispatching later events; report like an uncaught error.
+                traceback.print_exc()
+            finally:
+                events.task_done()
+
+    def flush(self) -> None:
+        """Block until every queued event has been dispatched."""
+        if self._events is not None:
+            self._events.join()
 
     def create_timer(self, name: str, duration: int) -> int:
         timer_id = self._manager.create_timer(name, duration)
@@ -331,6 +657,12 @@ class TimerManagerProxy:
         # self.new_tracking_task()
         return timer_id
 
+    def create_timers(self, timers: Iterable[Tuple[str, int]]) -> range:
+        timer_ids = self._manager.create_timers(timers)
+        for timer_id in timer_ids:
+            self._notify("created", timer_id)
+        return timer_ids
+
     def rm_timer(self, timer_id: int) -> None:
         self._manager.rm_timer(timer_id)
         self._notify("deleted", timer_id)
@@ -348,11 +680,11 @@ class TimerManagerProxy:
         self._manager.mark_timer_finished(timer_id)
         self._notify("finished", timer_id)
 
+    def mark_timers_finished(
+        self, timer_ids: Iterable[int], due_by: Optional[float] = None
+    ) -> Tuple[int, ...]:
+        finished = self._manager.mark_timers_finished(timer_ids, due_by)
+        for timer_id in finished:
+            self._notify("finished", timer_id)
+        return finished
 
-# class TimerWatcher:
-# """Monitor timers managed by :class:`TimerManager`.
-
-# This class runs an internal ``asyncio`` event loop in a daemon thread to
-# watch for timer expirations and fire callbacks when they finish.
-# """
-# def __ini__(self):